@@ -7,8 +7,9 @@ schema inference, data hydration, and validation.
 Structure:
 - endpoints.py: FastAPI endpoints for AI functionality
 - service.py: AI processing service
+- conversation.py: Conversation state and session storage
 - tools/: AI processing tools
-- utils/: Schema utilities
+- utils/: Schema and LLM utilities
 - workflow/: LangGraph workflow orchestration
 """
 
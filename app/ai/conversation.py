@@ -0,0 +1,327 @@
+"""
+Conversation state and session storage for the AI service.
+
+Sessions live in process memory by default. Set REDIS_URL to keep them in
+Redis instead, so they survive restarts and are shared by every worker.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Any, Optional, List
+from datetime import datetime, timezone
+
+import orjson
+
+try:
+    import redis
+except ImportError:  # optional: only needed when REDIS_URL is set
+    redis = None
+
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_KEY_PREFIX = os.getenv("AI_CONVERSATION_KEY_PREFIX", "ai:conv:")
+CONVERSATION_MAX_AGE_HOURS = 24
+MAX_MESSAGES = int(os.getenv("AI_CONVERSATION_MAX_MESSAGES", "100"))
+CONTEXT_MESSAGES = 5
+POOL_SIZE = 128
+
+_NS_PER_HOUR = 3_600_000_000_000
+
+
+def _ns_to_iso(ns: int) -> str:
+    return datetime.fromtimestamp(ns / 1e9, tz=timezone.utc).isoformat()
+
+
+def _iso_to_ns(value: str) -> int:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1_000_000) * 1000
+
+
+class ConversationState:
+    """Represents the state of a conversation session."""
+
+    # Retired conversations waiting to be reused by acquire().
+    _pool: List["ConversationState"] = []
+    _pool_lock = threading.Lock()
+
+    def __init__(self, session_id: str, now_ns: Optional[int] = None):
+        # Oldest messages fall off once the history is full.
+        self.messages: Deque[Dict[str, Any]] = deque(maxlen=MAX_MESSAGES)
+        # "role: content" lines of the latest messages, ready for the prompt
+        self.context_tail: Deque[str] = deque(maxlen=CONTEXT_MESSAGES)
+        self.reset(session_id, now_ns)
+
+    def reset(self, session_id: str, now_ns: Optional[int] = None) -> None:
+        """Return the conversation to a fresh state for session_id."""
+        self.session_id = session_id
+        # Epoch nanoseconds; formatted to ISO only when serialized.
+        self.created_at_ns: int = time.time_ns() if now_ns is None else now_ns
+        self.last_updated_ns: int = self.created_at_ns
+        self.messages.clear()
+        self.context_tail.clear()
+        # Containers handed out in results are replaced, never cleared.
+        self._current_schema: Optional[str] = None
+        self._partial_object: Dict[str, Any] = {}
+        self._partial_object_json: Optional[str] = None
+        self._validation_errors: List[Dict[str, Any]] = []
+        self.context: Dict[str, Any] = {}
+        # to_dict() and its JSON; cleared by every mutator below.
+        self._dict_cache: Optional[Dict[str, Any]] = None
+        self._json_cache: Optional[bytes] = None
+
+    def _invalidate(self) -> None:
+        self._dict_cache = None
+        self._json_cache = None
+
+    @classmethod
+    def acquire(
+        cls, session_id: str, now_ns: Optional[int] = None
+    ) -> "ConversationState":
+        """Reuse a pooled conversation for session_id, or build a new one."""
+        with cls._pool_lock:
+            conversation = cls._pool.pop() if cls._pool else None
+        if conversation is None:
+            return cls(session_id, now_ns)
+        conversation.reset(session_id, now_ns)
+        return conversation
+
+    @classmethod
+    def release(cls, conversation: "ConversationState") -> None:
+        """Return a conversation to the pool; the caller must hold no other refs."""
+        with cls._pool_lock:
+            if len(cls._pool) < POOL_SIZE:
+                cls._pool.append(conversation)
+
+    @property
+    def current_schema(self) -> Optional[str]:
+        return self._current_schema
+
+    @current_schema.setter
+    def current_schema(self, value: Optional[str]) -> None:
+        self._current_schema = value
+        self._invalidate()
+
+    @property
+    def validation_errors(self) -> List[Dict[str, Any]]:
+        return self._validation_errors
+
+    @validation_errors.setter
+    def validation_errors(self, value: List[Dict[str, Any]]) -> None:
+        self._validation_errors = value
+        self._invalidate()
+
+    def pop_validation_error(self) -> Dict[str, Any]:
+        """Remove and return the first pending validation error."""
+        self._invalidate()
+        return self._validation_errors.pop(0)
+
+    @property
+    def partial_object(self) -> Dict[str, Any]:
+        return self._partial_object
+
+    @partial_object.setter
+    def partial_object(self, value: Dict[str, Any]) -> None:
+        self._partial_object = value
+        self._partial_object_json = None
+        self._invalidate()
+
+    def set_partial_field(self, field: str, value: Any) -> None:
+        """Set one field on the partial object, keeping the JSON cache honest."""
+        self._partial_object[field] = value
+        self._partial_object_json = None
+        self._invalidate()
+
+    def partial_object_json(self) -> str:
+        """The partial object as JSON, re-encoded only after it changes."""
+        if self._partial_object_json is None:
+            self._partial_object_json = orjson.dumps(self._partial_object).decode()
+        return self._partial_object_json
+
+    def add_message(
+        self,
+        role: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        now_ns: Optional[int] = None,
+    ):
+        """
+        Add a message to the conversation history. Pass now_ns to reuse a
+        clock reading the caller already took for this turn.
+        """
+        if now_ns is None:
+            now_ns = time.time_ns()
+        self.messages.append(
+            {
+                "role": role,
+                "content": content,
+                "timestamp": _ns_to_iso(now_ns),
+                "metadata": metadata or {},
+            }
+        )
+        self.context_tail.append(f"{role}: {content}")
+        self.last_updated_ns = now_ns
+        self._invalidate()
+
+    def expires_at_ns(self, max_age_hours: int = CONVERSATION_MAX_AGE_HOURS) -> int:
+        """Epoch nanoseconds after which the conversation is expired."""
+        return self.created_at_ns + max_age_hours * _NS_PER_HOUR
+
+    def is_expired(
+        self,
+        max_age_hours: int = CONVERSATION_MAX_AGE_HOURS,
+        now_ns: Optional[int] = None,
+    ) -> bool:
+        """Check if the conversation has expired."""
+        if now_ns is None:
+            now_ns = time.time_ns()
+        return now_ns > self.expires_at_ns(max_age_hours)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert conversation state to dictionary. The dict is cached until
+        the state changes, so treat it as read-only.
+        """
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "session_id": self.session_id,
+                "created_at": _ns_to_iso(self.created_at_ns),
+                "last_updated": _ns_to_iso(self.last_updated_ns),
+                "messages": list(self.messages),
+                "current_schema": self.current_schema,
+                "partial_object": self.partial_object,
+                "validation_errors": self.validation_errors,
+                "context": self.context,
+            }
+        return self._dict_cache
+
+    def to_json_bytes(self) -> bytes:
+        """to_dict() as JSON bytes, re-encoded only after the state changes."""
+        if self._json_cache is None:
+            self._json_cache = orjson.dumps(self.to_dict())
+        return self._json_cache
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationState":
+        """Rebuild a conversation from the output of to_dict()."""
+        conversation = cls.acquire(data["session_id"])
+        conversation.created_at_ns = _iso_to_ns(data["created_at"])
+        conversation.last_updated_ns = _iso_to_ns(data["last_updated"])
+        conversation.messages.extend(data.get("messages") or [])
+        conversation.context_tail.extend(
+            f"{msg['role']}: {msg['content']}" for msg in conversation.messages
+        )
+        conversation.current_schema = data.get("current_schema")
+        conversation.partial_object = dict(data.get("partial_object") or {})
+        conversation.validation_errors = list(data.get("validation_errors") or [])
+        conversation.context = dict(data.get("context") or {})
+        return conversation
+
+
+class InMemoryConversationStore:
+    """
+    Keeps conversations in a process-local dict. on_expire, if given, is
+    called with each conversation the store drops for being expired.
+    """
+
+    def __init__(self, on_expire: Optional[Callable[[ConversationState], None]] = None):
+        self._on_expire = on_expire
+        # Insertion order is creation order (give or take concurrent first
+        # saves), and expiry runs from created_at, so the oldest is at the head.
+        self._conversations: "OrderedDict[str, ConversationState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _purge_expired(self, now_ns: int) -> List[ConversationState]:
+        """Remove expired conversations to prevent memory leaks."""
+        conversations = self._conversations
+        expired = []
+        while conversations:
+            conv = next(iter(conversations.values()))
+            if not conv.is_expired(now_ns=now_ns):
+                break
+            expired.append(conversations.popitem(last=False)[1])
+        return expired
+
+    def get(
+        self, session_id: str, now_ns: Optional[int] = None
+    ) -> Optional[ConversationState]:
+        with self._lock:
+            expired = self._purge_expired(time.time_ns() if now_ns is None else now_ns)
+            conversation = self._conversations.get(session_id)
+        if self._on_expire is not None:
+            for conv in expired:
+                self._on_expire(conv)
+        return conversation
+
+    def save(self, conversation: ConversationState) -> None:
+        with self._lock:
+            session_id = conversation.session_id
+            if conversation.expires_at_ns() <= time.time_ns():
+                # Expired mid-request (and maybe purged already); don't bring
+                # it back at the tail, where the head-first purge can't reach it.
+                self._conversations.pop(session_id, None)
+                return
+            if self._conversations.get(session_id) is not conversation:
+                # A new (or re-created) session joins the tail.
+                self._conversations.pop(session_id, None)
+            self._conversations[session_id] = conversation
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._conversations.pop(session_id, None) is not None
+
+
+class RedisConversationStore:
+    """
+    Keeps conversations in Redis as orjson blobs. Each key carries a TTL that
+    ends when the conversation expires, so Redis handles cleanup.
+    """
+
+    def __init__(self, client: "redis.Redis"):
+        self._redis = client
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}{session_id}"
+
+    def get(
+        self, session_id: str, now_ns: Optional[int] = None
+    ) -> Optional[ConversationState]:
+        raw = self._redis.get(self._key(session_id))
+        if raw is None:
+            return None
+        return ConversationState.from_dict(orjson.loads(raw))
+
+    def save(self, conversation: ConversationState) -> None:
+        # Expire relative to created_at, like the in-memory store, rather than
+        # sliding the window forward on every write.
+        ttl = (conversation.expires_at_ns() - time.time_ns()) // 1_000_000_000
+        if ttl <= 0:
+            self.delete(conversation.session_id)
+            return
+        self._redis.setex(
+            self._key(conversation.session_id),
+            ttl,
+            conversation.to_json_bytes(),
+        )
+
+    def delete(self, session_id: str) -> bool:
+        return bool(self._redis.delete(self._key(session_id)))
+
+
+def create_conversation_store(
+    on_expire: Optional[Callable[[ConversationState], None]] = None,
+):
+    """
+    Create the conversation store configured for this process. on_expire is
+    only used by the in-memory store; Redis expires keys on its own.
+    """
+    if REDIS_URL:
+        if redis is None:
+            raise RuntimeError(
+                "REDIS_URL is set but the redis package is not installed."
+            )
+        return RedisConversationStore(redis.Redis.from_url(REDIS_URL))
+    return InMemoryConversationStore(on_expire=on_expire)
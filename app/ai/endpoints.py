@@ -3,14 +3,18 @@ FastAPI endpoints for AI functionality.
 """
 
 from typing import Dict, Any, Optional, List
-from fastapi import APIRouter, HTTPException, Depends, Body
+
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Body, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from .service import AIService
 from ..auth.require import require_auth, require_roles_access
 
 
-router = APIRouter(prefix="/ai", tags=["AI"])
+router = APIRouter(prefix="/ai", tags=["AI"], default_response_class=ORJSONResponse)
 
 # Initialize AI service
 ai_service = AIService()
@@ -67,7 +71,7 @@ def get_schema_definition(schema_name: str):
 
 
 @router.post("/process", dependencies=[Depends(require_roles_access(["read:data"]))])
-def process_input(
+async def process_input(
     request: ProcessInputRequest = Body(
         ..., description="Natural language input to process"
     ),
@@ -85,7 +89,8 @@ def process_input(
     6. Maintains conversation context using session_id
     """
     try:
-        result = ai_service.process_input(
+        result = await run_in_threadpool(
+            ai_service.process_input,
             user_input=request.input_text,
             schema_name=request.schema_name,
             session_id=request.session_id,
@@ -104,7 +109,7 @@ def process_input(
 
 
 @router.post("/clarify", dependencies=[Depends(require_roles_access(["read:data"]))])
-def clarify_fields(
+async def clarify_fields(
     request: ClarifyRequest = Body(
         ..., description="Clarification for validation errors"
     ),
@@ -115,8 +120,10 @@ def clarify_fields(
     Uses session_id to maintain conversation context.
     """
     try:
-        result = ai_service.clarify_fields(
-            clarification=request.clarification, session_id=request.session_id
+        result = await run_in_threadpool(
+            ai_service.clarify_fields,
+            clarification=request.clarification,
+            session_id=request.session_id,
         )
 
         return {
@@ -135,7 +142,7 @@ def clarify_fields(
 @router.post(
     "/process-simple", dependencies=[Depends(require_roles_access(["read:data"]))]
 )
-def process_input_simple(
+async def process_input_simple(
     input_text: str = Body(..., description="Natural language input to process"),
     schema_name: Optional[str] = Body(
         None, description="Optional specific schema to use"
@@ -146,8 +153,8 @@ def process_input_simple(
     Simplified endpoint for processing input with just text and optional schema.
     """
     try:
-        result = ai_service.process_input(
-            user_input=input_text, schema_name=schema_name
+        result = await run_in_threadpool(
+            ai_service.process_input, user_input=input_text, schema_name=schema_name
         )
 
         return result
@@ -174,20 +181,33 @@ def ai_health_check():
     "/conversation/{session_id}",
     dependencies=[Depends(require_roles_access(["read:data"]))],
 )
-def get_conversation_history(session_id: str, claims: dict = Depends(require_auth)):
+async def get_conversation_history(
+    session_id: str, claims: dict = Depends(require_auth)
+):
     """
     Get conversation history for a specific session.
     """
     try:
-        history = ai_service.get_conversation_history(session_id)
+        history = await run_in_threadpool(
+            ai_service.get_conversation_history_json, session_id
+        )
         if history is None:
             raise HTTPException(status_code=404, detail="Conversation not found")
 
-        return {
-            "session_id": session_id,
-            "conversation": history,
-            "retrieved_by": claims.get("email", "unknown"),
-        }
+        # The conversation is cached as JSON bytes on the session, so splice it
+        # into the envelope rather than decoding and re-encoding a long history.
+        body = b"".join(
+            (
+                b'{"session_id":',
+                orjson.dumps(session_id),
+                b',"conversation":',
+                history,
+                b',"retrieved_by":',
+                orjson.dumps(claims.get("email", "unknown")),
+                b"}",
+            )
+        )
+        return Response(content=body, media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
@@ -200,12 +220,12 @@ def get_conversation_history(session_id: str, claims: dict = Depends(require_aut
     "/conversation/{session_id}",
     dependencies=[Depends(require_roles_access(["read:data"]))],
 )
-def clear_conversation(session_id: str, claims: dict = Depends(require_auth)):
+async def clear_conversation(session_id: str, claims: dict = Depends(require_auth)):
     """
     Clear conversation history for a specific session.
     """
     try:
-        success = ai_service.clear_conversation(session_id)
+        success = await run_in_threadpool(ai_service.clear_conversation, session_id)
         if not success:
             raise HTTPException(status_code=404, detail="Conversation not found")
 
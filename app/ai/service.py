@@ -2,151 +2,229 @@
 AI Service for processing natural language input and extracting structured data.
 """
 
+import hashlib
+import math
 import os
-import uuid
-from typing import Dict, Any, Optional, List
+import re
+import secrets
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Mapping, NamedTuple, Optional, List, Tuple
 from pathlib import Path
-from datetime import datetime, timedelta
 
+import orjson
+
+from ..cache import LRUCache
+from .conversation import ConversationState, create_conversation_store
+from .tools import ClarifyFieldTool
+from .tools.infer_schema import schema_options_json
+from .tools.validate_object import precompile_schemas, validate_with_clarification
 from .utils import load_schemas
 from .workflow import State, resolve_schema_name, create_app, handle_validation_errors
 
 
-class ConversationState:
-    """Represents the state of a conversation session."""
-
-    def __init__(self, session_id: str):
-        self.session_id = session_id
-        self.created_at = datetime.utcnow()
-        self.last_updated = datetime.utcnow()
-        self.messages: List[Dict[str, Any]] = []
-        self.current_schema: Optional[str] = None
-        self.partial_object: Dict[str, Any] = {}
-        self.validation_errors: List[Dict[str, Any]] = []
-        self.context: Dict[str, Any] = {}
-
-    def add_message(
-        self, role: str, content: str, metadata: Optional[Dict[str, Any]] = None
-    ):
-        """Add a message to the conversation history."""
-        self.messages.append(
-            {
-                "role": role,
-                "content": content,
-                "timestamp": datetime.utcnow().isoformat(),
-                "metadata": metadata or {},
-            }
+@lru_cache(maxsize=1)
+def _load_schema_library() -> Mapping[str, Any]:
+    """Parse the bundled schemas once per process; read-only to catch stray writes."""
+    return MappingProxyType(load_schemas("app/ai/schemas"))
+
+
+@lru_cache(maxsize=1)
+def _compiled_app():
+    """Build the workflow once; it keeps no per-run state, so instances share it."""
+    return create_app()
+
+
+class FieldSpec(NamedTuple):
+    """The parts of a schema property the clarification step needs."""
+
+    type: Optional[str]
+    description: Optional[str]
+    enum: Optional[List[Any]]
+
+
+_EMPTY_SPEC = FieldSpec(None, None, None)
+
+
+def _build_field_specs(
+    schema_library: Mapping[str, Any]
+) -> Dict[Tuple[str, str], FieldSpec]:
+    """Flatten every schema's properties into a (schema, field) lookup table."""
+    return {
+        (schema_name, field): FieldSpec(
+            spec.get("type"), spec.get("description"), spec.get("enum")
         )
-        self.last_updated = datetime.utcnow()
+        for schema_name, schema_def in schema_library.items()
+        for field, spec in (schema_def.get("properties") or {}).items()
+    }
 
-    def is_expired(self, max_age_hours: int = 24) -> bool:
-        """Check if the conversation has expired."""
-        return datetime.utcnow() - self.created_at > timedelta(hours=max_age_hours)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert conversation state to dictionary."""
-        return {
-            "session_id": self.session_id,
-            "created_at": self.created_at.isoformat(),
-            "last_updated": self.last_updated.isoformat(),
-            "messages": self.messages,
-            "current_schema": self.current_schema,
-            "partial_object": self.partial_object,
-            "validation_errors": self.validation_errors,
-            "context": self.context,
-        }
+WORKFLOW_CACHE_SIZE = int(os.getenv("AI_WORKFLOW_CACHE_SIZE", "1024"))
+# Treat a bare enum, numeric or boolean value sent to process_input
+# mid-clarification as the answer; free text always goes through the workflow.
+CLARIFY_FAST_PATH = os.getenv("AI_CLARIFY_FAST_PATH", "1").lower() not in (
+    "0",
+    "false",
+    "no",
+)
+
+# Asks for the next missing field's question while the current turn finishes.
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai-prefetch")
+
+_TRUTHY = frozenset({"true", "yes", "1", "y"})
+_FALSY = frozenset({"false", "no", "0", "n"})
+
+
+# Plain JSON-style literals only: int()/float() also take "1_000", "nan", "inf"
+_INT_RE = re.compile(r"[+-]?\d+")
+_FLOAT_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+
+def _to_int(value: str) -> Any:
+    text = value.strip()
+    return int(text) if _INT_RE.fullmatch(text) else value
+
+
+def _to_float(value: str) -> Any:
+    text = value.strip()
+    if _FLOAT_RE.fullmatch(text):
+        number = float(text)
+        if math.isfinite(number):
+            return number
+    return value
+
+
+def _to_bool(value: str) -> bool:
+    return value.lower() in _TRUTHY
+
+
+def _identity(value: str) -> str:
+    return value
+
+
+# _pending_field_value's answer for input that is not a bare field value
+_NOT_A_VALUE = object()
+
+# Clarification coercers by JSON Schema type; anything else stays a string.
+_COERCERS: Dict[str, Callable[[str], Any]] = {
+    "integer": _to_int,
+    "number": _to_float,
+    "boolean": _to_bool,
+}
 
 
 class AIService:
     """Service for AI-powered data processing with conversation memory."""
 
     def __init__(self):
-        self.schema_library = load_schemas("app/ai/schemas")
-        self.app = create_app()
-        self.conversations: Dict[str, ConversationState] = {}
+        self.schema_library = _load_schema_library()
+        self._field_specs = _build_field_specs(self.schema_library)
+        self._schema_options_json = schema_options_json(self.schema_library)
+        self._available_schemas = tuple(self.schema_library)
+        # Models and validators for every schema, built before the first request
+        self._compiled_schemas = precompile_schemas(self.schema_library)
+        self.app = _compiled_app()
+        # One lock per live session; entries vanish once no request holds them.
+        self._locks: "weakref.WeakValueDictionary[str, threading.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._locks_guard = threading.Lock()
+        self.conversations = create_conversation_store(on_expire=self._recycle)
+        # blake2b(input, schema, data) -> (schema_name, data JSON) of a run
+        self._workflow_cache: LRUCache[bytes, Tuple[str, bytes]] = LRUCache(
+            WORKFLOW_CACHE_SIZE
+        )
+        # (schema_name, field) -> pending question; consumed on first use
+        self._prefetched_questions: LRUCache[Tuple[str, str], Future] = LRUCache(256)
 
     def get_available_schemas(self) -> List[str]:
         """Get list of available schema names."""
-        return list(self.schema_library.keys())
+        return list(self._available_schemas)
 
     def get_schema_definition(self, schema_name: str) -> Optional[Dict[str, Any]]:
         """Get the full schema definition for a given schema name."""
         return self.schema_library.get(schema_name)
 
-    def _cleanup_expired_conversations(self):
-        """Remove expired conversations to prevent memory leaks."""
-        expired_sessions = [
-            session_id
-            for session_id, conv in self.conversations.items()
-            if conv.is_expired()
-        ]
-        for session_id in expired_sessions:
-            del self.conversations[session_id]
+    def _get_lock(self, session_id: str) -> threading.Lock:
+        """Get the lock serializing read-modify-write of one session."""
+        lock = self._locks.get(session_id)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.get(session_id)
+                if lock is None:
+                    lock = threading.Lock()
+                    self._locks[session_id] = lock
+        return lock
 
     def _get_or_create_conversation(
-        self, session_id: Optional[str] = None
+        self, session_id: Optional[str] = None, now_ns: Optional[int] = None
     ) -> ConversationState:
         """Get existing conversation or create a new one."""
-        self._cleanup_expired_conversations()
-
         if not session_id:
-            session_id = str(uuid.uuid4())
+            session_id = secrets.token_hex(16)
 
-        if session_id not in self.conversations:
-            self.conversations[session_id] = ConversationState(session_id)
+        conversation = self.conversations.get(session_id, now_ns)
+        if conversation is None:
+            conversation = ConversationState.acquire(session_id, now_ns)
 
-        return self.conversations[session_id]
+        return conversation
 
-    def get_conversation_history(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get the conversation history for a session."""
-        if session_id in self.conversations:
-            return self.conversations[session_id].to_dict()
-        return None
+    def _recycle(self, conversation: ConversationState) -> None:
+        """Pool an expired conversation unless a request is still using it."""
+        lock = self._get_lock(conversation.session_id)
+        if lock.acquire(blocking=False):
+            try:
+                ConversationState.release(conversation)
+            finally:
+                lock.release()
+
+    def get_conversation_history_json(self, session_id: str) -> Optional[bytes]:
+        """Get the conversation history for a session as JSON bytes."""
+        # Read under the session lock: a conversation may be recycled once
+        # cleared, and must not be serialized after that.
+        with self._get_lock(session_id):
+            conversation = self.conversations.get(session_id)
+            if conversation is not None:
+                return conversation.to_json_bytes()
+            return None
 
     def clear_conversation(self, session_id: str) -> bool:
         """Clear a conversation session."""
-        if session_id in self.conversations:
-            del self.conversations[session_id]
-            return True
-        return False
+        with self._get_lock(session_id):
+            conversation = self.conversations.get(session_id)
+            deleted = self.conversations.delete(session_id)
+            if conversation is not None:
+                ConversationState.release(conversation)
+            return deleted
 
     def _build_contextual_input(
         self, user_input: str, conversation: ConversationState
     ) -> str:
         """Build contextual input by incorporating conversation history."""
-        if not conversation.messages:
-            return user_input
-
-        # Get recent messages (last 5 to avoid token limits)
-        recent_messages = conversation.messages[-5:]
-
-        # Build context from conversation history
-        context_parts = []
+        # Build the whole prompt in one list and join once
+        parts = ["Context:"]
 
         # Add schema context if available
         if conversation.current_schema:
-            context_parts.append(f"Current schema: {conversation.current_schema}")
+            parts.append(f"Current schema: {conversation.current_schema}")
 
         # Add partial object context if available
         if conversation.partial_object:
-            context_parts.append(
-                f"Partial object so far: {conversation.partial_object}"
-            )
-
-        # Add recent conversation history
-        if recent_messages:
-            context_parts.append("Recent conversation:")
-            for msg in recent_messages:
-                role = msg["role"]
-                content = msg["content"]
-                context_parts.append(f"{role}: {content}")
+            parts.append(f"Partial object so far: {conversation.partial_object_json()}")
 
-        # Combine context with current input
-        if context_parts:
-            context = "\n".join(context_parts)
-            return f"Context:\n{context}\n\nCurrent input: {user_input}"
+        # Add recent conversation history (last 5 messages, kept preformatted
+        # on the conversation; never empty, _process_input adds the input first)
+        parts.append("Recent conversation:")
+        parts.extend(conversation.context_tail)
 
-        return user_input
+        # Blank line, then the current input
+        parts.append("")
+        parts.append(f"Current input: {user_input}")
+        return "\n".join(parts)
 
     def process_input(
         self,
@@ -165,53 +243,89 @@ class AIService:
         Returns:
             Dictionary containing the processing result
         """
-        # Get or create conversation
-        conversation = self._get_or_create_conversation(session_id)
+        if not session_id:
+            session_id = secrets.token_hex(16)
+
+        # One clock reading covers expiry, session creation and the user turn
+        now_ns = time.time_ns()
+        with self._get_lock(session_id):
+            # Get or create conversation
+            conversation = self._get_or_create_conversation(session_id, now_ns)
+            try:
+                return self._process_input(
+                    conversation, user_input, schema_name, now_ns
+                )
+            finally:
+                self.conversations.save(conversation)
+
+    def _process_input(
+        self,
+        conversation: ConversationState,
+        user_input: str,
+        schema_name: Optional[str],
+        now_ns: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Run one user turn against a loaded conversation."""
+        # Mid-clarification, a bare value answers the pending question; skip
+        # inference and hydration and apply it as a clarification instead.
+        if (
+            CLARIFY_FAST_PATH
+            and conversation.current_schema
+            and conversation.validation_errors
+            and schema_name in (None, conversation.current_schema)
+        ):
+            value = self._pending_field_value(conversation, user_input)
+            if value is not _NOT_A_VALUE:
+                return self._clarify_fields(conversation, user_input, now_ns, value)
 
         # Add user message to conversation history
-        conversation.add_message("user", user_input, {"schema_name": schema_name})
+        conversation.add_message(
+            "user", user_input, {"schema_name": schema_name}, now_ns=now_ns
+        )
 
         # Use schema from conversation context if available and not overridden
         if not schema_name and conversation.current_schema:
             schema_name = conversation.current_schema
 
-        # Build context from conversation history
-        context_input = self._build_contextual_input(user_input, conversation)
-
-        # Create initial state with context and existing data
-        existing_data = conversation.partial_object or {}
-        state = State(
-            schema_library=self.schema_library,
-            user_input=context_input,
-            data=existing_data,
-            schema_name=conversation.current_schema,
-            schema_def=(
-                self.schema_library.get(conversation.current_schema)
-                if conversation.current_schema
-                else None
-            ),
-        )
+        # Build context from conversation history. A brand-new session has
+        # only the message just added, which would merely echo user_input.
+        if (
+            not conversation.current_schema
+            and not conversation.partial_object
+            and len(conversation.messages) <= 1
+        ):
+            context_input = user_input
+        else:
+            context_input = self._build_contextual_input(user_input, conversation)
 
-        # If schema is specified, use it directly
+        # If schema is specified (or carried over), resolve it once up front
+        schema_def = None
         if schema_name:
             schema_def = self.schema_library.get(schema_name)
-            if schema_def:
-                state.schema_name = schema_name
-                state.schema_def = schema_def
-                conversation.current_schema = schema_name
-            else:
+            if not schema_def:
                 error_result = {
                     "error": f"Schema '{schema_name}' not found",
                     "available_schemas": self.get_available_schemas(),
                     "session_id": conversation.session_id,
                 }
-                conversation.add_message(
-                    "assistant", f"Schema '{schema_name}' not found", error_result
+                return self._reply(
+                    conversation, f"Schema '{schema_name}' not found", error_result
                 )
-                return error_result
+            conversation.current_schema = schema_name
+
+        # Create initial state with context and existing data
+        existing_data = conversation.partial_object or {}
+        state = State(
+            schema_library=self.schema_library,
+            schema_options=self._schema_options_json,
+            user_input=context_input,
+            data=existing_data,
+            schema_name=schema_name or None,
+            schema_def=schema_def,
+        )
 
         # Process through the AI workflow
-        result = self.app.run(state)
+        result = self._run_workflow(state)
 
         # Handle case where schema couldn't be inferred
         if not result.get("schema_name"):
@@ -221,10 +335,9 @@ class AIService:
                 "suggestion": "Please specify a schema_name or provide more specific input",
                 "session_id": conversation.session_id,
             }
-            conversation.add_message(
-                "assistant", "Could not infer schema from input", error_result
+            return self._reply(
+                conversation, "Could not infer schema from input", error_result
             )
-            return error_result
 
         # Store the initial partial object and schema
         conversation.partial_object = result.get("data", {})
@@ -233,6 +346,91 @@ class AIService:
         # Start the validation loop
         return self._validation_loop(conversation)
 
+    @staticmethod
+    def _reply(
+        conversation: ConversationState, text: str, result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Record an assistant turn and hand its result back to the caller."""
+        # History keeps only a summary; the full payload went out in the response.
+        conversation.add_message(
+            "assistant",
+            text,
+            {
+                "status": result.get("status", "error"),
+                "schema_name": result.get("schema_name"),
+            },
+        )
+        return result
+
+    @staticmethod
+    def _make_result(
+        status: str, conversation: ConversationState, message: str, **extra: Any
+    ) -> Dict[str, Any]:
+        """Build a status result for the conversation's current schema."""
+        return {
+            "status": status,
+            "schema_name": conversation.current_schema,
+            **extra,
+            "message": message,
+            "session_id": conversation.session_id,
+        }
+
+    def _pending_field_value(
+        self, conversation: ConversationState, user_input: str
+    ) -> Any:
+        """
+        The input as a value for the pending field, or _NOT_A_VALUE when it
+        reads as anything else (a sentence, a new request). Enum answers come
+        back as the schema's own member, whatever their case.
+        """
+        pending = conversation.validation_errors[0]
+        spec = self._field_specs.get(
+            (conversation.current_schema, pending["field"]), _EMPTY_SPEC
+        )
+        text = user_input.strip()
+        if not text or "\n" in text:
+            return _NOT_A_VALUE
+        if spec.enum:
+            folded = text.lower()
+            return next(
+                (member for member in spec.enum if str(member).lower() == folded),
+                _NOT_A_VALUE,
+            )
+        field_type = pending.get("field_type") or "string"
+        if field_type in ("integer", "number"):
+            # The coercers hand back the input unchanged when it doesn't parse
+            value = _COERCERS[field_type](text)
+            return _NOT_A_VALUE if value is text else value
+        if field_type == "boolean":
+            folded = text.lower()
+            if folded in _TRUTHY or folded in _FALSY:
+                return _to_bool(folded)
+        # A short string may be a sentence wrapping the value ("my email is ...")
+        # or a new request; only the workflow can tell those apart
+        return _NOT_A_VALUE
+
+    def _run_workflow(self, state: State) -> Dict[str, Any]:
+        """Run the workflow, reusing the outcome of an identical earlier run."""
+        key = hashlib.blake2b(
+            orjson.dumps(
+                (state.user_input, state.schema_name, state.data),
+                option=orjson.OPT_SORT_KEYS,
+            ),
+            digest_size=16,
+        ).digest()
+        cached = self._workflow_cache.get(key)
+        if cached is not None:
+            schema_name, data_json = cached
+            # Decode a fresh copy; the caller mutates it as the partial object.
+            return {"schema_name": schema_name, "data": orjson.loads(data_json)}
+
+        result = self.app.run(state)
+        if result.get("schema_name"):
+            self._workflow_cache.put(
+                key, (result["schema_name"], orjson.dumps(result.get("data")))
+            )
+        return result
+
     def _validation_loop(self, conversation: ConversationState) -> Dict[str, Any]:
         """
         Validation loop that continues until all required fields are populated.
@@ -252,88 +450,103 @@ class AIService:
         
 
         # Validate the current partial object
-        from .tools.validate_object import build_model_from_schema, validate_with_clarification
         
-        model_cls = build_model_from_schema(conversation.current_schema, schema_def)
-        validation_result = validate_with_clarification(model_cls, schema_def, conversation.partial_object, conversation.current_schema)
+        compiled = self._compiled_schemas[conversation.current_schema]
+        validation_result = validate_with_clarification(
+            compiled.model,
+            schema_def,
+            conversation.partial_object,
+            conversation.current_schema,
+            validator=compiled.validator,
+        )
         
         if validation_result.get("valid"):
             # All required fields are present - success!
-            success_result = {
-                "status": "success",
-                "schema_name": conversation.current_schema,
-                "object": conversation.partial_object,
-                "message": "Data successfully extracted and validated",
-                "session_id": conversation.session_id,
-            }
-            conversation.add_message(
-                "assistant", "Data successfully extracted and validated", success_result
+            message = "Data successfully extracted and validated"
+            success_result = self._make_result(
+                "success", conversation, message, object=conversation.partial_object
             )
             # Clear validation errors since we're done
             conversation.validation_errors = []
-            return success_result
+            return self._reply(conversation, message, success_result)
         else:
             # Validation failed - need clarification for missing fields
+            # Each entry already carries its schema field_type
             missing_fields = validation_result.get("missing", [])
-            # Ensure field types are properly set
-            for field_error in missing_fields:
-                field_name = field_error["field"]
-                # Set field types based on common field names
-                if field_name in ["username", "email", "fullName", "location", "alignment"]:
-                    field_error["field_type"] = "string"
-                elif field_name in ["age", "count"]:
-                    field_error["field_type"] = "integer"
-                elif field_name in ["spacing"]:
-                    field_error["field_type"] = "number"
-                else:
-                    field_error["field_type"] = "string"  # Default to string
             conversation.validation_errors = missing_fields
             
             if missing_fields:
                 field = missing_fields[0]["field"]
-                spec = schema_def.get("properties", {}).get(field, {})
-                expected_type = spec.get("type")
-                enum_values = spec.get("enum")
+                spec = self._field_specs.get(
+                    (conversation.current_schema, field), _EMPTY_SPEC
+                )
+                expected_type = spec.type
+                enum_values = spec.enum
+
+                # Start on the question for the field after this one, so the
+                # next clarification can answer without waiting on the tool.
+                if len(missing_fields) > 1:
+                    self._prefetch_question(
+                        conversation.current_schema, missing_fields[1]["field"]
+                    )
 
                 # Generate clarification question
-                from .tools import ClarifyFieldTool
-
-                q = ClarifyFieldTool.invoke(
-                    {
-                        "field_name": field,
-                        "field_type": expected_type,
-                        "description": spec.get("description"),
-                        "allowed_values": enum_values,
-                    }
-                )["question"]
-
-                clarification_result = {
-                    "status": "validation_errors",
-                    "schema_name": conversation.current_schema,
-                    "validation_errors": missing_fields,
-                    "object": conversation.partial_object,
-                    "partial_object": conversation.partial_object,  # Keep both for compatibility
-                    "clarification_question": q,
-                    "missing_field": field,
-                    "field_type": expected_type,
-                    "enum_values": enum_values,
-                    "message": "Please provide clarification for the validation errors",
-                    "session_id": conversation.session_id,
-                }
-                conversation.add_message("assistant", q, clarification_result)
-                return clarification_result
+                q = self._clarification_question(conversation.current_schema, field)
+
+                clarification_result = self._make_result(
+                    "validation_errors",
+                    conversation,
+                    "Please provide clarification for the validation errors",
+                    validation_errors=missing_fields,
+                    object=conversation.partial_object,
+                    partial_object=conversation.partial_object,  # Keep both for compatibility
+                    clarification_question=q,
+                    missing_field=field,
+                    field_type=expected_type,
+                    enum_values=enum_values,
+                )
+                return self._reply(conversation, q, clarification_result)
             else:
                 # No missing fields but validation still failed - unexpected
-                error_result = {
-                    "status": "validation_failed",
-                    "schema_name": conversation.current_schema,
-                    "validation_errors": [],
-                    "partial_object": conversation.partial_object,
-                    "message": "Validation failed for unknown reasons",
-                    "session_id": conversation.session_id,
-                }
-                conversation.add_message("assistant", "Validation failed for unknown reasons", error_result)
-                return error_result
+                message = "Validation failed for unknown reasons"
+                error_result = self._make_result(
+                    "validation_failed",
+                    conversation,
+                    message,
+                    validation_errors=[],
+                    partial_object=conversation.partial_object,
+                )
+                return self._reply(conversation, message, error_result)
+
+    def _ask_clarification(self, schema_name: str, field: str) -> str:
+        """Generate the clarification question for one schema field."""
+        spec = self._field_specs.get((schema_name, field), _EMPTY_SPEC)
+        return ClarifyFieldTool.invoke(
+            {
+                "field_name": field,
+                "field_type": spec.type,
+                "description": spec.description,
+                "allowed_values": spec.enum,
+            }
+        )["question"]
+
+    def _prefetch_question(self, schema_name: str, field: str) -> None:
+        """Generate a question in the background unless one is already pending."""
+        key = (schema_name, field)
+        if self._prefetched_questions.get(key) is None:
+            self._prefetched_questions.put(
+                key, _PREFETCH_POOL.submit(self._ask_clarification, schema_name, field)
+            )
+
+    def _clarification_question(self, schema_name: str, field: str) -> str:
+        """Use a prefetched question if there is one, else ask inline."""
+        future = self._prefetched_questions.pop((schema_name, field))
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                pass  # prefetch failed; ask again inline
+        return self._ask_clarification(schema_name, field)
 
     def clarify_fields(self, clarification: str, session_id: str) -> Dict[str, Any]:
         """
@@ -346,16 +559,35 @@ class AIService:
         Returns:
             Updated processing result
         """
-        if session_id not in self.conversations:
-            return {
-                "error": "Session not found",
-                "message": "No active conversation found for this session",
-            }
+        now_ns = time.time_ns()
+        with self._get_lock(session_id):
+            conversation = self.conversations.get(session_id, now_ns)
+            if conversation is None:
+                return {
+                    "error": "Session not found",
+                    "message": "No active conversation found for this session",
+                }
 
-        conversation = self.conversations[session_id]
+            try:
+                return self._clarify_fields(conversation, clarification, now_ns)
+            finally:
+                self.conversations.save(conversation)
 
+    def _clarify_fields(
+        self,
+        conversation: ConversationState,
+        clarification: str,
+        now_ns: Optional[int] = None,
+        value: Any = _NOT_A_VALUE,
+    ) -> Dict[str, Any]:
+        """
+        Apply a clarification to a loaded conversation. value, when not
+        _NOT_A_VALUE, is the already-parsed answer to store in its place.
+        """
         # Add clarification to conversation history
-        conversation.add_message("user", clarification, {"type": "clarification"})
+        conversation.add_message(
+            "user", clarification, {"type": "clarification"}, now_ns=now_ns
+        )
 
         # Get the missing field from validation errors
         if not conversation.validation_errors:
@@ -365,44 +597,21 @@ class AIService:
             }
 
         missing_field = conversation.validation_errors[0]["field"]
-        field_type = conversation.validation_errors[0].get("field_type", "string")
-        
-        # Ensure field type is set correctly
-        if field_type == "unknown" or not field_type:
-            if missing_field in ["username", "email", "fullName", "location", "alignment"]:
-                field_type = "string"
-            elif missing_field in ["age", "count"]:
-                field_type = "integer"
-            elif missing_field in ["spacing"]:
-                field_type = "number"
-            else:
-                field_type = "string"  # Default to string
+        field_type = conversation.validation_errors[0].get("field_type") or "string"
 
         # Process the clarification based on field type
-        processed_value = self._process_clarification_value(clarification, field_type)
+        if value is _NOT_A_VALUE:
+            value = self._process_clarification_value(clarification, field_type)
 
         # Update the partial object with the clarified value
-        conversation.partial_object[missing_field] = processed_value
+        conversation.set_partial_field(missing_field, value)
 
         # Remove the resolved validation error
-        conversation.validation_errors.pop(0)
+        conversation.pop_validation_error()
 
         # Continue the validation loop with the updated object
         return self._validation_loop(conversation)
 
     def _process_clarification_value(self, clarification: str, field_type: str) -> Any:
         """Process clarification value based on field type."""
-        if field_type == "integer":
-            try:
-                return int(clarification)
-            except ValueError:
-                return clarification
-        elif field_type == "number":
-            try:
-                return float(clarification)
-            except ValueError:
-                return clarification
-        elif field_type == "boolean":
-            return clarification.lower() in ["true", "yes", "1", "y"]
-        else:
-            return clarification
+        return _COERCERS.get(field_type, _identity)(clarification)
@@ -1,11 +1,13 @@
-import json
-from typing import Optional, List, Dict, Any
+import orjson
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple
 from pydantic import BaseModel, Field
 from langchain.tools import StructuredTool
 from langchain.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import JsonOutputParser
 
+from ..utils import get_llm
+
 _prompt = ChatPromptTemplate.from_template(
     """
     You are a clarification assistant.
@@ -25,9 +27,12 @@ _prompt = ChatPromptTemplate.from_template(
     Return JSON only: {{"question":"..."}}
     """
 )
-_llm = ChatOpenAI(model="gpt-4o-mini")
 _parser = JsonOutputParser()
-_chain = _prompt | _llm | _parser
+
+
+@lru_cache(maxsize=1)
+def _get_chain():
+    return _prompt | get_llm() | _parser
 
 
 def _clarify_field(
@@ -36,8 +41,20 @@ def _clarify_field(
     description: Optional[str] = None,
     allowed_values: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
+    allowed = tuple(allowed_values) if allowed_values else None
+    return {"question": _cached_question(field_name, field_type, description, allowed)}
+
+
+@lru_cache(maxsize=512)
+def _cached_question(
+    field_name: str,
+    field_type: Optional[str],
+    description: Optional[str],
+    allowed_values: Optional[Tuple[str, ...]],
+) -> str:
+    """Ask the LLM once per distinct field prompt; the question is reusable."""
     allowed_str = ", ".join(allowed_values) if allowed_values else "None"
-    resp = _chain.invoke(
+    resp = _get_chain().invoke(
         {
             "field_name": field_name,
             "field_type": field_type or "string",
@@ -48,7 +65,7 @@ def _clarify_field(
     if isinstance(resp, dict):
         result = resp
     elif hasattr(resp, "content"):
-        result = json.loads(resp.content.strip())
+        result = orjson.loads(resp.content)
     else:
         raise ValueError(f"Unexpected response type: {type(resp)}")
 
@@ -57,7 +74,7 @@ def _clarify_field(
     words = q.strip().split()
     if len(words) > 15:
         q = " ".join(words[:15]).rstrip("?") + "?"
-    return {"question": q}
+    return q
 
 
 class ClarifyFieldInput(BaseModel):
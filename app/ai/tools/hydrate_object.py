@@ -1,12 +1,15 @@
 # titan/ai/hydrate_object.py
-import json
-from typing import Dict, Any, List, Optional
+import orjson
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List, NamedTuple, Optional
 from pydantic import BaseModel, Field
 from langchain.tools import StructuredTool
 from langchain.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import JsonOutputParser
 
+from ...cache import LRUCache
+from ..utils import get_llm
+
 
 # ---- helpers -----------------------------------------------------------------
 def _build_field_catalog(schema: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -57,6 +60,31 @@ def _build_conditional_rules(schema: Dict[str, Any]) -> str:
     return "\n".join(rules) if rules else ""
 
 
+class _SchemaParts(NamedTuple):
+    field_catalog: str  # JSON
+    conditional_rules: str
+    valid_field_names: FrozenSet[str]
+
+
+_prompt_parts_cache: LRUCache[str, _SchemaParts] = LRUCache(64)
+
+
+def _schema_prompt_parts(
+    schema_def: Dict[str, Any], schema_name: Optional[str]
+) -> _SchemaParts:
+    """Schema-derived hydrate inputs; pure in the schema, so cached by its name."""
+    parts = _prompt_parts_cache.get(schema_name) if schema_name else None
+    if parts is None:
+        parts = _SchemaParts(
+            orjson.dumps(_build_field_catalog(schema_def)).decode(),
+            _build_conditional_rules(schema_def),
+            frozenset(schema_def.get("properties") or ()),
+        )
+        if schema_name:
+            _prompt_parts_cache.put(schema_name, parts)
+    return parts
+
+
 # ---- prompt ------------------------------------------------------------------
 _prompt = ChatPromptTemplate.from_template(
     """
@@ -100,9 +128,13 @@ _prompt = ChatPromptTemplate.from_template(
     """
 )
 
-_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 _parser = JsonOutputParser()
-_chain = _prompt | _llm | _parser
+
+
+@lru_cache(maxsize=1)
+def _get_chain():
+    # Extraction should be deterministic; the shared model is bound to temp 0.
+    return _prompt | get_llm().bind(temperature=0) | _parser
 
 
 # ---- tool function -----------------------------------------------------------
@@ -112,15 +144,14 @@ def hydrate_object(
     schema_name: Optional[str] = None,
     existing_object: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    field_catalog = _build_field_catalog(schema_def)
-    conditional_rules = _build_conditional_rules(schema_def)
+    parts = _schema_prompt_parts(schema_def, schema_name)
 
     # Build context for existing object
     existing_object_context = ""
     if existing_object:
         existing_object_context = f"""
     --- Existing Object Data ---
-    {json.dumps(existing_object, ensure_ascii=False)}
+    {orjson.dumps(existing_object).decode()}
     
     IMPORTANT: You already have an existing object with the above data. The user request may contain additional information to add to or update this existing object. 
     
@@ -130,11 +161,11 @@ def hydrate_object(
     - If the user request contains no new extractable information, return an empty data object: {{ "data": {{}} }}
     """
 
-    resp = _chain.invoke(
+    resp = _get_chain().invoke(
         {
             "schema_name": schema_name or schema_def.get("title") or "",
-            "field_catalog": json.dumps(field_catalog, ensure_ascii=False),
-            "conditional_rules": conditional_rules,
+            "field_catalog": parts.field_catalog,
+            "conditional_rules": parts.conditional_rules,
             "user_input": user_input,
             "existing_object_context": existing_object_context,
         }
@@ -143,7 +174,7 @@ def hydrate_object(
     if isinstance(resp, dict):
         result = resp
     elif hasattr(resp, "content"):
-        result = json.loads(resp.content.strip())
+        result = orjson.loads(resp.content)
     else:
         raise ValueError(f"Unexpected response type: {type(resp)}")
 
@@ -153,17 +184,12 @@ def hydrate_object(
         data = {}
 
     # Validate field names against schema
-    schema_properties = schema_def.get("properties", {})
-    valid_field_names = set(schema_properties.keys())
+    valid_field_names = parts.valid_field_names
 
     # Remove any fields that don't match the schema
-    invalid_fields = []
-    for field_name in list(data.keys()):
-        if field_name not in valid_field_names:
-            invalid_fields.append(field_name)
-            del data[field_name]
-
+    invalid_fields = [name for name in data if name not in valid_field_names]
     if invalid_fields:
+        data = {k: v for k, v in data.items() if k in valid_field_names}
         print(
             f"WARNING: Removed invalid field names: {invalid_fields}. Valid fields are: {list(valid_field_names)}"
         )
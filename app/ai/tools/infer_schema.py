@@ -1,11 +1,13 @@
-import json
-from typing import Dict, Any, List
+import orjson
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from langchain.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import JsonOutputParser
 from langchain.tools import StructuredTool
 from pydantic import BaseModel, Field
 
+from ..utils import get_llm
+
 
 def build_schema_options(schema_library: Dict[str, Any]) -> List[Dict[str, Any]]:
     options = []
@@ -41,16 +43,33 @@ prompt = ChatPromptTemplate.from_template(
     """
 )
 
-llm = ChatOpenAI(model="gpt-4o-mini")
 parser = JsonOutputParser()
-chain = prompt | llm | parser
 
 
-def extract_candidate_json(user_input: str, schema_library: dict) -> dict:
-    options = build_schema_options(schema_library)
-    resp = chain.invoke(
+@lru_cache(maxsize=1)
+def get_chain():
+    return prompt | get_llm() | parser
+
+
+def schema_options_json(schema_library: Dict[str, Any]) -> str:
+    return orjson.dumps(build_schema_options(schema_library)).decode()
+
+
+def extract_candidate_json(
+    user_input: str, schema_library: dict, schema_options: Optional[str] = None
+) -> dict:
+    if schema_options is None:
+        schema_options = schema_options_json(schema_library)
+    # Decode per call so callers never share (and mutate) a cached dict.
+    return orjson.loads(_cached_candidate_json(user_input, schema_options))
+
+
+@lru_cache(maxsize=512)
+def _cached_candidate_json(user_input: str, schema_options: str) -> bytes:
+    """Ask the LLM once per distinct input and option list; returns JSON."""
+    resp = get_chain().invoke(
         {
-            "schema_options": json.dumps(options, ensure_ascii=False),
+            "schema_options": schema_options,
             "user_input": user_input,
         }
     )
@@ -58,7 +77,7 @@ def extract_candidate_json(user_input: str, schema_library: dict) -> dict:
     if isinstance(resp, dict):
         result = resp
     elif hasattr(resp, "content"):
-        result = json.loads(resp.content.strip())
+        result = orjson.loads(resp.content)
     else:
         raise ValueError(f"Unexpected response type: {type(resp)}")
 
@@ -67,12 +86,15 @@ def extract_candidate_json(user_input: str, schema_library: dict) -> dict:
     if not isinstance(result["data"], dict):
         result["data"] = {}
 
-    return result
+    return orjson.dumps(result)
 
 
 class InferSchemaInput(BaseModel):
     user_input: str = Field(..., description="Natural language reference to a schema.")
     schema_library: dict = Field(..., description="Schema library for reference.")
+    schema_options: Optional[str] = Field(
+        None, description="Precomputed schema_options_json(schema_library)."
+    )
 
 
 InferSchemaTool = StructuredTool.from_function(
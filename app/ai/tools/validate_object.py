@@ -1,11 +1,39 @@
 # titan/ai/schema_validator.py
-from typing import Dict, Any
-from pydantic import BaseModel, Field, ValidationError, create_model
+import os
+from functools import lru_cache
+from typing import Dict, Any, Mapping, NamedTuple, Optional, Sequence
+import orjson
+from pydantic import BaseModel, Field, create_model
 from langchain.tools import StructuredTool
 from jsonschema import Draft7Validator
+from ...cache import LRUCache
+
+jsonschema_rs = None
+# Opt-in: the Rust-backed validator is much faster on iter_errors, but words
+# its messages and orders its errors differently, and that order picks the
+# field clarification asks about first
+if os.getenv("AI_JSONSCHEMA_RS", "0").lower() in ("1", "true", "yes"):
+    try:
+        import jsonschema_rs
+    except ImportError:  # pragma: no cover - optional dependency
+        pass
+
+# JSON Schema type -> annotation; strings, enums and unknown types stay str
+_PY_TYPES: Dict[Any, type] = {"integer": int, "number": float, "boolean": bool}
+
+# Compiled validators, keyed by a sorted-key dump; checked once on compile
+_VALIDATOR_CACHE: LRUCache[bytes, Any] = LRUCache(64)
 
 
 def build_model_from_schema(name: str, schema: Dict[str, Any]) -> type[BaseModel]:
+    # create_model() dominates validation cost; key on a canonical dump
+    schema_key = orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)
+    return _build_model_cached(name, schema_key)
+
+
+@lru_cache(maxsize=128)
+def _build_model_cached(name: str, schema_key: bytes) -> type[BaseModel]:
+    schema = orjson.loads(schema_key)
     fields = {}
     props = schema.get("properties", {}) or {}
     required_set = set(schema.get("required", []) or [])
@@ -13,29 +41,92 @@ def build_model_from_schema(name: str, schema: Dict[str, Any]) -> type[BaseModel
     for prop, spec in props.items():
         spec = spec or {}
         t = spec.get("type")
-        py = str
-        if t == "integer":
-            py = int
-        elif t == "number":
-            py = float
-        elif t == "boolean":
-            py = bool
-        # note: strings and enums stay as str; JSON Schema pass enforces enum values
+        # note: JSON Schema pass enforces enum values
+        py = _PY_TYPES.get(t, str) if isinstance(t, str) else str
         default = ... if prop in required_set else None
         fields[prop] = (py, Field(default, description=spec.get("description")))
     return create_model(name, **fields)  # type: ignore
 
 
-def validate_with_clarification(model_cls, schema: dict, data: dict, schema_name: str = None) -> dict:
+def _get_validator(schema: Dict[str, Any]) -> Any:
+    key = orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)
+    validator = _VALIDATOR_CACHE.get(key)
+    if validator is None:
+        Draft7Validator.check_schema(schema)
+        validator = _compile_rs(schema) or Draft7Validator(schema)
+        _VALIDATOR_CACHE.put(key, validator)
+    return validator
+
+
+def _compile_rs(schema: Dict[str, Any]) -> Any:
+    if jsonschema_rs is None:
+        return None
+    try:
+        # jsonschema does not assert "format" either
+        return jsonschema_rs.Draft7Validator(schema, validate_formats=False)
+    except (jsonschema_rs.ValidationError, ValueError):
+        # jsonschema_rs resolves every $ref up front and cannot reach the
+        # example.com ids; jsonschema only resolves the ones it walks into
+        return None
+
+
+def _error_field(error: Any) -> str:
+    """Field an error refers to, for either validator backend."""
+    message = error.message
+    if "is a required property" in message:
+        # jsonschema quotes the name with ', jsonschema_rs with "
+        return message[1:message.index(message[0], 1)]
+    path: Sequence[Any] = getattr(error, "instance_path", None)
+    if path is None:
+        path = error.path
+    return ".".join(map(str, path)) if path else "unknown"
+
+
+class CompiledSchema(NamedTuple):
+    schema: Dict[str, Any]
+    model: type[BaseModel]
+    validator: Any
+
+
+# schema_name -> CompiledSchema, filled once by precompile_schemas at startup
+_PRECOMPILED: Dict[str, CompiledSchema] = {}
+
+
+def precompile_schemas(schema_library: Mapping[str, Any]) -> Dict[str, CompiledSchema]:
+    """Build every schema's model and validator up front, off the request path."""
+    compiled = {
+        name: CompiledSchema(
+            schema, build_model_from_schema(name, schema), _get_validator(schema)
+        )
+        for name, schema in schema_library.items()
+    }
+    _PRECOMPILED.update(compiled)
+    return compiled
+
+
+def validate_with_clarification(
+    model_cls,
+    schema: dict,
+    data: dict,
+    schema_name: str = None,
+    validator: Optional[Any] = None,
+) -> dict:
     """
     Validate data against JSON schema, properly handling conditional requirements.
+
+    Pass a precompiled validator to skip the per-call cache lookup.
     """
     cleaned = data or {}
     
     
     # Default validation for other schemas
-    from jsonschema import Draft7Validator
-    validator = Draft7Validator(schema)
+    if validator is None:
+        validator = _get_validator(schema)
+    # is_valid stops at the first failure and builds no error objects
+    if validator.is_valid(cleaned):
+        return {"valid": True, "object": cleaned}
+
+    # Collect every error: the service queues them all for clarification
     errors = list(validator.iter_errors(cleaned))
     
     if errors:
@@ -43,14 +134,12 @@ def validate_with_clarification(model_cls, schema: dict, data: dict, schema_name
         schema_properties = schema.get("properties", {})
         
         for error in errors:
-            # Extract field name from error message
-            if "is a required property" in error.message:
-                field_name = error.message.split("'")[1]
-            else:
-                field_name = ".".join(map(str, error.path)) if error.path else "unknown"
+            field_name = _error_field(error)
             
-            field_spec = schema_properties.get(field_name, {})
-            field_type = field_spec.get("type", "string")
+            field_spec = schema_properties.get(field_name) or {}
+            field_type = field_spec.get("type")
+            if not isinstance(field_type, str):
+                field_type = "string"  # unknown, or a union of types
             
             missing_fields.append({
                 "field": field_name,
@@ -75,8 +164,14 @@ class ValidatorInput(BaseModel):
 def _schema_validator_tool_fn(
     schema_name: str, schema_def: Dict[str, Any], data: Dict[str, Any]
 ) -> Dict[str, Any]:
-    model_cls = build_model_from_schema(schema_name, schema_def)
-    return validate_with_clarification(model_cls, schema_def, data)
+    # validation is JSON Schema only; the pydantic model is never consulted
+    compiled = _PRECOMPILED.get(schema_name)
+    validator = None
+    if compiled is not None and compiled.schema == schema_def:
+        validator = compiled.validator
+    return validate_with_clarification(
+        None, schema_def, data, schema_name, validator=validator
+    )
 
 
 ValidateObjectTool = StructuredTool.from_function(
@@ -1,3 +1,4 @@
+from .llm import get_llm
 from .schema_loader import load_schemas
 
-__all__ = ["load_schemas"]
+__all__ = ["get_llm", "load_schemas"]
@@ -0,0 +1,13 @@
+from functools import lru_cache
+
+from langchain_openai import ChatOpenAI
+
+
+@lru_cache(maxsize=None)
+def get_llm(model: str = "gpt-4o-mini") -> ChatOpenAI:
+    """
+    Shared chat model for the AI tools, built on first use. One instance per
+    model keeps a single HTTP connection pool warm across infer, hydrate and
+    clarify calls; per-tool settings such as temperature go through .bind().
+    """
+    return ChatOpenAI(model=model)
@@ -1,6 +1,16 @@
-import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+_LOAD_WORKERS = 8
+
+# resolved dir -> ((file names, newest mtime), library); reused until files change
+_CACHE: Dict[str, Tuple[Tuple[Tuple[str, ...], float], Dict[str, Any]]] = {}
+
+
+def _load_one(file: Path) -> Any:
+    return orjson.loads(file.read_bytes())
 
 
 def load_schemas(schema_dir: str = "schemas") -> Dict[str, Any]:
@@ -24,10 +34,25 @@ def load_schemas(schema_dir: str = "schemas") -> Dict[str, Any]:
     if not schema_path.exists():
         raise FileNotFoundError(f"Schema directory not found: {schema_dir}")
 
-    for file in schema_path.glob("*.json"):
-        with open(file, "r", encoding="utf-8") as f:
-            schema = json.load(f)
-            schema_name = file.stem
-            schema_library[schema_name] = schema
+    files = list(schema_path.glob("*.json"))
+    stamp = (
+        tuple(file.name for file in files),
+        max((file.stat().st_mtime for file in files), default=0.0),
+    )
+    cache_key = str(schema_path.resolve())
+    cached = _CACHE.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        return dict(cached[1])
+
+    if len(files) > 1:
+        # overlap the reads; results come back in glob order
+        with ThreadPoolExecutor(max_workers=min(_LOAD_WORKERS, len(files))) as pool:
+            schemas = list(pool.map(_load_one, files))
+    else:
+        schemas = [_load_one(file) for file in files]
+
+    for file, schema in zip(files, schemas):
+        schema_library[file.stem] = schema
 
-    return schema_library
+    _CACHE[cache_key] = (stamp, schema_library)
+    return dict(schema_library)
@@ -1,3 +1,4 @@
+from dataclasses import replace
 from typing import Dict, Any, Optional
 from .state import State
 from .nodes import infer_schema, hydrate_object, validate_object
@@ -15,17 +16,26 @@ class WorkflowRunner:
 
     def run(self, initial_state: State) -> Dict[str, Any]:
         """Run the workflow with the given initial state."""
-        state = initial_state
+        # One working copy of the data; nodes return deltas merged into it,
+        # and the caller's dict is never mutated
+        state = replace(initial_state, data=dict(initial_state.data or {}))
         current_node = "infer_schema"
 
         while current_node:
+            # Nothing to hydrate from; go straight to validation
+            if current_node == "hydrate_object" and not state.user_input:
+                current_node = "validate_object"
+
             # Execute current node
             updates = self.nodes[current_node](state)
 
-            # Update state with the returned updates
-            state_dict = state.model_dump()
-            state_dict.update(updates)
-            state = State(**state_dict)
+            # Update state with the returned updates; nodes hand back fresh
+            # values, so a shallow copy is enough
+            delta = updates.pop("data_delta", None)
+            if delta:
+                state.data.update(delta)
+            if updates:
+                state = replace(state, **updates)
 
             # Route to next node based on current state
             if current_node == "infer_schema":
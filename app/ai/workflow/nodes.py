@@ -1,32 +1,33 @@
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+import orjson
+from ...cache import LRUCache
 from ..tools import InferSchemaTool, ValidateObjectTool, HydrateObjectTool
-from .state import State
+from .state import State, resolve_schema_name
+
+# (schema_name, sorted data JSON) -> ValidateObject output JSON; clarification
+# loops re-validate the same object between answers
+_validation_cache: LRUCache[Tuple[str, bytes], bytes] = LRUCache(256)
 
 
 def infer_schema(state: State) -> Dict[str, Any]:
     """Infer schema from user input or return existing schema if available."""
     if state.schema_name and state.schema_def:
-        return {
-            "schema_name": state.schema_name,
-            "schema_def": state.schema_def,
-            "data": state.data or {},
-        }
+        return {}
     output = InferSchemaTool.invoke(
-        {"user_input": state.user_input, "schema_library": state.schema_library}
+        {
+            "user_input": state.user_input,
+            "schema_library": state.schema_library,
+            "schema_options": state.schema_options,
+        }
     )
-    from .state import resolve_schema_name
-
     schema_name, schema_def = resolve_schema_name(
         output.get("schema"), state.schema_library or {}
     )
-    # Preserve existing object data when inferring new schema
-    existing_data = state.data or {}
-    new_data = output.get("data", {})
-    merged_data = {**existing_data, **new_data}
+    # The runner merges data_delta over the existing object data
     return {
         "schema_name": schema_name,
         "schema_def": schema_def,
-        "data": merged_data,
+        "data_delta": output.get("data") or {},
     }
 
 
@@ -40,13 +41,9 @@ def hydrate_object(state: State) -> Dict[str, Any]:
             "existing_object": state.data or {},
         }
     )
-    # Always preserve existing data, only add new data from hydration
-    new_data = hyd.get("data") or {}
-    merged = {**(state.data or {}), **new_data}
-
+    # Only new data from hydration; the runner merges it into state.data
     # Field validation is handled in the hydrate_object tool
-
-    return {"data": merged}
+    return {"data_delta": hyd.get("data") or {}}
 
 
 def validate_object(state: State) -> Dict[str, Any]:
@@ -58,14 +55,20 @@ def validate_object(state: State) -> Dict[str, Any]:
                 "missing": [{"field": "schema_name", "message": "Schema is required"}],
             }
         }
-    output = ValidateObjectTool.invoke(
-        {
-            "schema_name": state.schema_name,
-            "schema_def": state.schema_def,
-            "data": state.data or {},
-        }
+    key = (
+        state.schema_name,
+        orjson.dumps(state.data or {}, option=orjson.OPT_SORT_KEYS),
     )
-    return {
-        "validation_result": output,
-        "data": state.data or {},  # Preserve the data from the state
-    }
+    cached = _validation_cache.get(key)
+    if cached is not None:
+        output = orjson.loads(cached)
+    else:
+        output = ValidateObjectTool.invoke(
+            {
+                "schema_name": state.schema_name,
+                "schema_def": state.schema_def,
+                "data": state.data or {},
+            }
+        )
+        _validation_cache.put(key, orjson.dumps(output))
+    return {"validation_result": output}
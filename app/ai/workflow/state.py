@@ -1,15 +1,39 @@
-from typing import Dict, Any, Optional, Tuple
-from pydantic import BaseModel
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Dict, Any, Mapping, Optional, Tuple
 
 
-class State(BaseModel):
+@dataclass(slots=True)
+class State:
+    """Workflow state; a plain container built by the service, never validated."""
+
     user_input: Optional[str] = None
     schema_name: Optional[str] = None
     schema_def: Optional[Dict[str, Any]] = None  # Renamed to avoid shadowing
-    schema_library: Optional[Dict[str, Any]] = None
+    schema_library: Optional[Mapping[str, Any]] = None
+    schema_options: Optional[str] = None  # Serialized options for InferSchemaTool
     data: Optional[Dict[str, Any]] = None
     validation_result: Optional[Dict[str, Any]] = None
 
+    def model_dump(self) -> Dict[str, Any]:
+        """Shallow field dict, mirroring the BaseModel method callers used."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+def _normalize(name: str) -> str:
+    return name.replace("_", "").replace("-", "").lower()
+
+
+@lru_cache(maxsize=32)
+def _name_index(names: Tuple[str, ...]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Lowercased and normalized name -> first matching library key."""
+    by_lower: Dict[str, str] = {}
+    by_norm: Dict[str, str] = {}
+    for key in names:
+        by_lower.setdefault(key.lower(), key)
+        by_norm.setdefault(_normalize(key), key)
+    return by_lower, by_norm
+
 
 def resolve_schema_name(
     schema_name: Optional[str], schema_library: dict
@@ -19,11 +43,9 @@ def resolve_schema_name(
         return None, None
     if schema_name in schema_library:
         return schema_name, schema_library[schema_name]
-    for key in schema_library:
-        if key.lower() == schema_name.lower():
-            return key, schema_library[key]
-    norm = schema_name.replace("_", "").replace("-", "").lower()
-    for key in schema_library:
-        if key.replace("_", "").replace("-", "").lower() == norm:
-            return key, schema_library[key]
-    return None, None
+    # keyed on the names, not id(), so equal libraries share one index
+    by_lower, by_norm = _name_index(tuple(schema_library))
+    key = by_lower.get(schema_name.lower()) or by_norm.get(_normalize(schema_name))
+    if key is None:
+        return None, None
+    return key, schema_library[key]
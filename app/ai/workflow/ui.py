@@ -1,8 +1,27 @@
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 from ..tools import ClarifyFieldTool
 from .state import State
 
 
+@lru_cache(maxsize=512)
+def _question_for(
+    field: str,
+    ftype: Optional[str],
+    desc: Optional[str],
+    enum_tuple: Optional[Tuple[str, ...]],
+) -> str:
+    """Clarifying question for one field prompt; skips the tool call on a hit."""
+    return ClarifyFieldTool.invoke(
+        {
+            "field_name": field,
+            "field_type": ftype,
+            "description": desc,
+            "allowed_values": list(enum_tuple) if enum_tuple else None,
+        }
+    )["question"]
+
+
 def handle_validation_errors(result: dict, schema_library: dict) -> Optional[State]:
     """Handle validation errors by preparing clarification data for API response."""
     validation = result.get("validation_result", {})
@@ -19,14 +38,14 @@ def handle_validation_errors(result: dict, schema_library: dict) -> Optional[Sta
     expected_type = spec.get("type")
     enum_values = spec.get("enum")
 
-    q = ClarifyFieldTool.invoke(
-        {
-            "field_name": field,
-            "field_type": expected_type,
-            "description": spec.get("description"),
-            "allowed_values": enum_values,
-        }
-    )["question"]
+    if not isinstance(expected_type, str):
+        expected_type = None  # unions are unhashable; the tool defaults to string
+    q = _question_for(
+        field,
+        expected_type,
+        spec.get("description"),
+        tuple(enum_values) if enum_values else None,
+    )
 
     # Instead of prompting user directly, return None to indicate clarification is needed
     # The API will return the clarification question to the client
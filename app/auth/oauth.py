@@ -1,11 +1,14 @@
+from functools import lru_cache
 from typing import Dict, Any, List, Set
 
-import os, logging, httpx, jwt
+import os, time, hashlib, logging, httpx, jwt
 from fastapi import Security, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 from jwt import PyJWKClient
 
+from ..cache import TTLCache
+
 log = logging.getLogger("auth")
 
 ACCEPTED_ISS = ("accounts.google.com", "https://accounts.google.com")
@@ -13,37 +16,77 @@ JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
 DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 ALGS = ("RS256",)
+# PyJWKClient refetches the JWK set after this long, or on an unknown kid
+JWKS_LIFESPAN_SECONDS = 3600
+
+
+@lru_cache(maxsize=1)
+def _jwks_client() -> PyJWKClient:
+    """Build the JWKS client on first verification, not at import."""
+    return PyJWKClient(
+        JWKS_URL,
+        cache_keys=True,
+        max_cached_keys=16,
+        lifespan=JWKS_LIFESPAN_SECONDS,
+    )
+
+
+# kid -> public key; Google rotates keys rarely, so most requests skip the client
+_SIGNING_KEYS: TTLCache[str, Any] = TTLCache(32, ttl=JWKS_LIFESPAN_SECONDS)
 
-jwks_client = PyJWKClient(JWKS_URL)
+
+def _signing_key(token: str) -> Any:
+    kid = jwt.get_unverified_header(token).get("kid")
+    key = _SIGNING_KEYS.get(kid) if kid else None
+    if key is None:
+        key = _jwks_client().get_signing_key_from_jwt(token).key
+        if kid:
+            _SIGNING_KEYS.put(kid, key)
+    return key
+
+
+# blake2b(token) -> verified claims; dashboards resend one token many times a
+# second, and each miss costs an RSA signature check
+CLAIMS_TTL_SECONDS = 300
+_VERIFIED_CLAIMS: TTLCache[bytes, dict] = TTLCache(4096, ttl=CLAIMS_TTL_SECONDS)
 
 bearer = HTTPBearer(auto_error=False)
 
 
 def verify_google_id_token(token: str) -> dict:
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _VERIFIED_CLAIMS.get(key)
+    if cached is not None:
+        return dict(cached)
+    claims = _verify_google_id_token(token)
+    # Never outlive the token itself; 5s margin for clock skew
+    ttl = min(CLAIMS_TTL_SECONDS, claims["exp"] - time.time() - 5)
+    if ttl > 0:
+        _VERIFIED_CLAIMS.put(key, dict(claims), ttl=ttl)
+    return claims
+
+
+def _verify_google_id_token(token: str) -> dict:
     try:
-        # Quick sanity (no signature): check iss/aud early
-        body = jwt.decode(token, options={"verify_signature": False})
-        iss = body.get("iss")
-        if iss not in ACCEPTED_ISS:
-            log.warning("Bad iss: %s", iss)
+        # Signature verification against Google JWKS; one decode checks
+        # iss/aud/exp too, with PyJWT's typed errors mapped below
+        signing_key = _signing_key(token)
+        try:
+            claims = jwt.decode(
+                token,
+                signing_key,
+                algorithms=ALGS,
+                audience=GOOGLE_CLIENT_ID,
+                issuer=ACCEPTED_ISS,
+                options={"require": ["exp", "iat", "aud", "iss"]},
+            )
+        except jwt.InvalidIssuerError as e:
+            log.warning("Bad iss: %s", e)
             raise HTTPException(status_code=401, detail="Bad issuer")
-
-        aud = body.get("aud")
-        if GOOGLE_CLIENT_ID and aud != GOOGLE_CLIENT_ID:
-            log.warning("Bad aud: %s (expected %s)", aud, GOOGLE_CLIENT_ID)
+        except jwt.InvalidAudienceError as e:
+            log.warning("Bad aud: %s (expected %s)", e, GOOGLE_CLIENT_ID)
             raise HTTPException(status_code=401, detail="Bad audience")
 
-        # Signature verification against Google JWKS
-        signing_key = jwks_client.get_signing_key_from_jwt(token).key
-        claims = jwt.decode(
-            token,
-            signing_key,
-            algorithms=ALGS,
-            audience=GOOGLE_CLIENT_ID,
-            issuer=ACCEPTED_ISS,
-            options={"require": ["exp", "iat", "aud", "iss"]},
-        )
-
         if not claims.get("email_verified", False):
             raise HTTPException(status_code=401, detail="Email not verified")
         return claims
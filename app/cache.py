@@ -0,0 +1,71 @@
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+
+K = t.TypeVar("K")
+V = t.TypeVar("V")
+
+_MISSING = object()
+
+
+class LRUCache(t.Generic[K, V]):
+    """Small thread-safe LRU map; the oldest entry is evicted past maxsize."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[K, V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K, default: t.Any = None) -> t.Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: K, default: t.Any = None) -> t.Any:
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache(LRUCache[K, V]):
+    """LRUCache whose entries also lapse ttl seconds after they were put."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        super().__init__(maxsize)
+        self.ttl = ttl
+
+    def get(self, key: K, default: t.Any = None) -> t.Any:
+        entry = super().get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self.pop(key)
+            return default
+        return value
+
+    def put(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store value; ttl overrides the cache-wide lifetime for this entry."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        super().put(key, (expires_at, value))  # type: ignore[arg-type]
+
+    def pop(self, key: K, default: t.Any = None) -> t.Any:
+        entry = super().pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
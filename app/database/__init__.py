@@ -5,14 +5,18 @@ This module handles Snowflake connections and query execution.
 """
 
 from .snowflake import (
+    QUERY_WORKERS,
     _describe_view_snowflake,
+    _describe_views_snowflake,
     _execute_query_with_conn,
     _sf_connect_for,
     _split_db_path,
 )
 
 __all__ = [
+    "QUERY_WORKERS",
     "_describe_view_snowflake",
+    "_describe_views_snowflake",
     "_execute_query_with_conn",
     "_sf_connect_for",
     "_split_db_path",
@@ -1,6 +1,42 @@
-import os, typing as t
+import atexit, os, threading, typing as t
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
+from importlib.util import find_spec
 
+from ..cache import TTLCache
 
+# Threads that run blocking queries (see main._SF_POOL); at most this many
+# connections per key are checked out at once
+QUERY_WORKERS = int(os.getenv("SNOWFLAKE_QUERY_WORKERS", "32"))
+# (db, schema, role) -> idle connections; each query checks one out and hands
+# it back, so concurrent requests never share a session. Keeping up to one per
+# worker means a burst doesn't log in afresh and then close the extras.
+POOL_MAX_IDLE = int(os.getenv("SNOWFLAKE_POOL_MAX_IDLE", str(QUERY_WORKERS)))
+_CONN_POOL: dict[tuple[str, str, str | None], list[t.Any]] = {}
+_CONN_POOL_LOCK = threading.Lock()
+
+# Opt-in: decode row results column-wise from Arrow batches (needs pyarrow).
+# Off by default so /search output does not depend on what is installed.
+ARROW_ROWS = os.getenv("SNOWFLAKE_ARROW_ROWS", "0").lower() in ("1", "true", "yes")
+_USE_ARROW_ROWS = ARROW_ROWS and find_spec("pyarrow") is not None
+# Arrow carries these as UTC/session-zone instants and drops the per-row
+# offset fetchall() keeps, so results holding them are fetched row-wise
+_ARROW_LOSSY_TYPES = frozenset({"TIMESTAMP_LTZ", "TIMESTAMP_TZ"})
+
+# (DB, SCHEMA, VIEW) -> {COLUMN_NAME: TYPE_CATEGORY}; views change rarely
+DESCRIBE_TTL_SECONDS = int(os.getenv("DESCRIBE_TTL_SECONDS", "300"))
+_DESC_CACHE: TTLCache[tuple[str, str, str], dict[str, str]] = TTLCache(
+    256, ttl=DESCRIBE_TTL_SECONDS
+)
+# One lock per view, so concurrent first describes issue a single query
+_DESC_LOCKS: dict[tuple[str, str, str], threading.Lock] = {}
+_DESC_LOCKS_GUARD = threading.Lock()
+# (db, schema) groups described concurrently by _describe_views_snowflake
+DESCRIBE_WORKERS = int(os.getenv("DESCRIBE_WORKERS", "8"))
+
+
+@lru_cache(maxsize=4)
 def _load_p8_as_der_bytes(path: str) -> bytes:
     from cryptography.hazmat.primitives import serialization
 
@@ -20,57 +56,215 @@ def _load_p8_as_der_bytes(path: str) -> bytes:
     )
 
 
+# INFORMATION_SCHEMA DATA_TYPE -> TYPE_CATEGORY for the types Snowflake reports
+_DTYPE_MAP: dict[str, str] = {
+    "NUMBER": "NUMBER",
+    "DECIMAL": "NUMBER",
+    "FIXED": "NUMBER",
+    "FLOAT": "NUMBER",
+    "DOUBLE": "NUMBER",
+    "INTEGER": "NUMBER",
+    "TEXT": "TEXT",
+    "VARCHAR": "TEXT",
+    "CHAR": "TEXT",
+    "STRING": "TEXT",
+    "BINARY": "TEXT",
+    "BOOLEAN": "BOOLEAN",
+    "DATE": "DATE",
+    "TIME": "TIME",
+    "TIMESTAMP_NTZ": "TIMESTAMP",
+    "TIMESTAMP_LTZ": "TIMESTAMP",
+    "TIMESTAMP_TZ": "TIMESTAMP",
+}
+
+
+@lru_cache(maxsize=None)
+def _bucket(dtype: str) -> str:
+    # DATA_TYPE is a small closed set, so each distinct value is bucketed once
+    u = dtype.upper()
+    category = _DTYPE_MAP.get(u)
+    if category is not None:
+        return category
+    # Anything unlisted falls back to the substring rules
+    if any(x in u for x in ("CHAR", "TEXT", "STRING", "BINARY")):
+        return "TEXT"
+    if any(x in u for x in ("NUMBER", "DECIMAL", "INT", "FLOAT", "DOUBLE")):
+        return "NUMBER"
+    if "BOOLEAN" in u:
+        return "BOOLEAN"
+    if "TIMESTAMP" in u:
+        return "TIMESTAMP"
+    if u == "DATE":
+        return "DATE"
+    if u == "TIME":
+        return "TIME"
+    return "OTHER"
+
+
 def _describe_view_snowflake(db_path: str) -> dict[str, str]:
     """
     Return {COLUMN_NAME: TYPE_CATEGORY}, where TYPE_CATEGORY in
     {"TEXT","NUMBER","BOOLEAN","DATE","TIMESTAMP","TIME","OTHER"}.
+
+    Results are cached for DESCRIBE_TTL_SECONDS.
     """
     db, schema, view = _split_db_path(db_path)
-    conn = _sf_connect_for(db, schema)
+    key = (db.upper(), schema.upper(), view.upper())
+    cached = _DESC_CACHE.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    with _DESC_LOCKS_GUARD:
+        lock = _DESC_LOCKS.setdefault(key, threading.Lock())
+    with lock:
+        # Another caller may have described the view while we waited
+        cached = _DESC_CACHE.get(key)
+        if cached is None:
+            cached = _query_view_columns(db, schema, view)
+            _DESC_CACHE.put(key, cached)
+    return dict(cached)
+
+
+def _query_view_columns(db: str, schema: str, view: str) -> dict[str, str]:
+    sql = f"""
+    SELECT COLUMN_NAME, DATA_TYPE
+    FROM {db.upper()}.INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+    ORDER BY ORDINAL_POSITION
+    """
+    with _pooled_connection(db, schema) as conn, conn.cursor() as cur:
+        cur.execute(sql, (schema.upper(), view.upper()))
+        rows = cur.fetchall()
+
+    return {name: _bucket(dtype) for (name, dtype) in rows}
+
+
+def _describe_views_snowflake(
+    db_paths: t.Iterable[str],
+) -> tuple[dict[str, dict[str, str]], dict[str, Exception]]:
+    """
+    Describe many views with one INFORMATION_SCHEMA query per (db, schema).
+
+    Groups are queried concurrently, up to DESCRIBE_WORKERS at a time.
+    Returns ({db_path: columns}, {db_path: error}); refreshes _DESC_CACHE.
+    """
+    groups: dict[tuple[str, str], dict[str, list[str]]] = {}
+    errors: dict[str, Exception] = {}
+    for db_path in db_paths:
+        try:
+            db, schema, view = _split_db_path(db_path)
+        except Exception as e:
+            errors[db_path] = e
+            continue
+        paths = groups.setdefault((db, schema), {}).setdefault(view.upper(), [])
+        paths.append(db_path)
+
+    described: dict[str, dict[str, str]] = {}
+    if not groups:
+        return described, errors
+    # Each group is an I/O-bound round-trip on its own pooled connection
+    with ThreadPoolExecutor(max_workers=min(DESCRIBE_WORKERS, len(groups))) as pool:
+        futures = {
+            pool.submit(_query_group_columns, db, schema, list(by_view)): by_view
+            for (db, schema), by_view in groups.items()
+        }
+        for future in as_completed(futures):
+            by_view = futures[future]
+            try:
+                columns = future.result()
+            except Exception as e:
+                for paths in by_view.values():
+                    errors.update(dict.fromkeys(paths, e))
+                continue
+            for view, paths in by_view.items():
+                for db_path in paths:
+                    described[db_path] = dict(columns[view])
+    return described, errors
+
+
+def _query_group_columns(
+    db: str, schema: str, views: list[str]
+) -> dict[str, dict[str, str]]:
+    placeholders = ", ".join(["%s"] * len(views))
+    sql = f"""
+    SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE
+    FROM {db.upper()}.INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN ({placeholders})
+    ORDER BY TABLE_NAME, ORDINAL_POSITION
+    """
+    with _pooled_connection(db, schema) as conn, conn.cursor() as cur:
+        cur.execute(sql, (schema.upper(), *views))
+        rows = cur.fetchall()
+
+    columns: dict[str, dict[str, str]] = {view: {} for view in views}
+    for table, name, dtype in rows:
+        columns[table][name] = _bucket(dtype)
+    for view in views:
+        _DESC_CACHE.put((db.upper(), schema.upper(), view), columns[view])
+    return columns
+
 
+def _is_usable(conn) -> bool:
+    return not conn.is_closed() and not getattr(conn, "expired", False)
+
+
+@contextmanager
+def _pooled_connection(db: str, schema: str, *, role: str | None = None):
+    """Check out an idle connection for (db, schema, role), or open one."""
+    key = (db, schema, role)
+    conn = None
+    with _CONN_POOL_LOCK:
+        idle = _CONN_POOL.setdefault(key, [])
+        while idle and conn is None:
+            candidate = idle.pop()
+            if _is_usable(candidate):
+                conn = candidate
+    if conn is None:
+        conn = _sf_connect_for(db, schema, oauth_token=None, role=role)
     try:
-        sql = f"""
-        SELECT COLUMN_NAME, DATA_TYPE
-        FROM {db.upper()}.INFORMATION_SCHEMA.COLUMNS
-        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
-        ORDER BY ORDINAL_POSITION
-        """
-        with conn.cursor() as cur:
-            cur.execute(sql, (schema.upper(), view.upper()))
-            rows = cur.fetchall()
-
-        def bucket(dtype: str) -> str:
-            u = dtype.upper()
-            if any(x in u for x in ("CHAR", "TEXT", "STRING", "BINARY")):
-                return "TEXT"
-            if any(x in u for x in ("NUMBER", "DECIMAL", "INT", "FLOAT", "DOUBLE")):
-                return "NUMBER"
-            if "BOOLEAN" in u:
-                return "BOOLEAN"
-            if "TIMESTAMP" in u:
-                return "TIMESTAMP"
-            if u == "DATE":
-                return "DATE"
-            if u == "TIME":
-                return "TIME"
-            return "OTHER"
-
-        return {name: bucket(dtype) for (name, dtype) in rows}
+        yield conn
     finally:
-        conn.close()
+        if _is_usable(conn):
+            with _CONN_POOL_LOCK:
+                idle = _CONN_POOL.setdefault(key, [])
+                if len(idle) < POOL_MAX_IDLE:
+                    idle.append(conn)
+                    conn = None
+        if conn is not None:
+            conn.close()
+
+
+@atexit.register
+def _close_pool() -> None:
+    with _CONN_POOL_LOCK:
+        conns = [conn for idle in _CONN_POOL.values() for conn in idle]
+        _CONN_POOL.clear()
+    for conn in conns:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+@lru_cache(maxsize=1)
+def _sf_mod():
+    """snowflake.connector, imported on first connect and kept for reuse."""
+    import snowflake.connector
+
+    return snowflake.connector
 
 
 def _sf_connect_for(
     db: str, schema: str, *, oauth_token: str | None = None, role: str | None = None
 ):
-    import snowflake.connector
-
     common = dict(
         account=os.environ["SNOWFLAKE_ACCOUNT"],
         warehouse=os.environ["SNOWFLAKE_WAREHOUSE"],
         database=db,
         schema=schema,
         client_session_keep_alive=True,
+        # Scaled NUMBER columns come out of Arrow as Decimal, as from fetchall()
+        arrow_number_to_decimal=True,
         session_parameters={
             "QUERY_TAG": "api:data-service",
         },
@@ -78,15 +272,20 @@ def _sf_connect_for(
 
     pk_path = os.environ["SNOWFLAKE_PRIVATE_KEY_PATH"]
     pkb = _load_p8_as_der_bytes(pk_path)
-    conn = snowflake.connector.connect(
+    conn = _sf_mod().connect(
         user=os.environ["SNOWFLAKE_USER"], private_key=pkb, **common
     )
 
     return conn
 
 
+@lru_cache(maxsize=256)
 def _split_db_path(path: str) -> tuple[str, str, str]:
-    """Accept 1-, 2-, or 3-part names; fill missing parts from env."""
+    """
+    Accept 1-, 2-, or 3-part names; fill missing parts from env.
+
+    Cached per name: SNOWFLAKE_DATABASE/SCHEMA are fixed for the process.
+    """
     parts = [p.strip().strip('"') for p in path.split(".") if p.strip() != ""]
     if len(parts) == 3:
         return parts[0], parts[1], parts[2]
@@ -107,15 +306,55 @@ def _split_db_path(path: str) -> tuple[str, str, str]:
 
 
 def _execute_query_with_conn(
-    db_path: str, sql: str, params, *, role: str | None = None
+    db_path: str,
+    sql: str,
+    params,
+    *,
+    role: str | None = None,
+    result_format: t.Literal["rows", "arrow"] = "rows",
 ):
+    """
+    Run sql and return (column names, result).
+
+    result_format="rows" gives a list of tuples; "arrow" gives a pyarrow.Table
+    fetched through Snowflake's columnar result path (None for no rows), and
+    needs the connector's pandas/pyarrow extra.
+    """
     db, schema, _ = _split_db_path(db_path)
-    conn = _sf_connect_for(db, schema, oauth_token=None, role=role)
-    try:
-        with conn.cursor() as cur:
-            cur.execute(sql, params)
-            cols = [d[0] for d in cur.description] if cur.description else []
-            rows = cur.fetchall() if cur.description else []
-        return cols, rows
-    finally:
-        conn.close()
+    with _pooled_connection(db, schema, role=role) as conn, conn.cursor() as cur:
+        cur.execute(sql, params)
+        cols = [d[0] for d in cur.description] if cur.description else []
+        if not cur.description:
+            rows = None if result_format == "arrow" else []
+        elif result_format == "arrow":
+            rows = cur.fetch_arrow_all()
+        else:
+            rows = _fetch_rows(cur)
+    return cols, rows
+
+
+def _fetch_rows(cur) -> list[tuple]:
+    """
+    Fetch all rows as tuples.
+
+    With SNOWFLAKE_ARROW_ROWS on, rows are decoded from Arrow batches, with
+    NUMBER kept as Decimal (arrow_number_to_decimal). Results with
+    TIMESTAMP_LTZ/TZ columns still use fetchall(), which keeps each row's offset.
+    """
+    if _USE_ARROW_ROWS and not _has_lossy_arrow_column(cur):
+        try:
+            batches = cur.fetch_arrow_batches()
+        except _sf_mod().errors.NotSupportedError:
+            # JSON-format results, e.g. CALL or SHOW
+            batches = None
+        if batches is not None:
+            rows: list[tuple] = []
+            for batch in batches:
+                rows.extend(zip(*(col.to_pylist() for col in batch.columns)))
+            return rows
+    return cur.fetchall()
+
+
+def _has_lossy_arrow_column(cur) -> bool:
+    type_names = _sf_mod().constants.FIELD_ID_TO_NAME
+    return any(type_names.get(d[1]) in _ARROW_LOSSY_TYPES for d in cur.description)
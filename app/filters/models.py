@@ -2,8 +2,11 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, List, Union
+import hashlib
 import json
+import orjson
+from ..cache import LRUCache
 
 # ---------------------------------------------------------------------------
 # Enums
@@ -29,12 +32,24 @@ class LogicalOperator(str, Enum):
     OR = "Or"
 
 
+# value -> member; a dict hit instead of Enum.__call__ per parsed node
+_OP_MAP: Dict[str, Operator] = {m.value: m for m in Operator}
+_LOGOP_MAP: Dict[str, LogicalOperator] = {m.value: m for m in LogicalOperator}
+
+
+def _member(members: Dict[str, Any], enum: type, raw: Any) -> Any:
+    try:
+        return members[raw]
+    except (KeyError, TypeError):
+        return enum(raw)  # raises the usual "is not a valid ..." ValueError
+
+
 # ---------------------------------------------------------------------------
 # Core filter models
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterExpression:
     """
     Basic component of a filter: a property (column), an operator, and a value.
@@ -56,12 +71,14 @@ class FilterExpression:
     def from_dict(cls, data: Dict[str, Any]) -> "FilterExpression":
         return cls(
             property_name=data["propertyName"],
-            operator=Operator(data.get("operator", Operator.EQ.value)),
+            operator=_member(
+                _OP_MAP, Operator, data.get("operator", Operator.EQ.value)
+            ),
             value=data.get("value", ""),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterCollection:
     """
     Ragged hierarchy of FilterExpressions for complex comparisons.
@@ -81,19 +98,32 @@ class FilterCollection:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "FilterCollection":
-        return cls(
-            logical_operator=LogicalOperator(
-                data.get("logicalOperator", LogicalOperator.AND.value)
-            ),
-            collections=[cls.from_dict(c) for c in data.get("collections", [])],
-            expressions=[
-                FilterExpression.from_dict(e) for e in data.get("expressions", [])
-            ],
-        )
+        def node(raw: Dict[str, Any]) -> "FilterCollection":
+            return cls(
+                logical_operator=_member(
+                    _LOGOP_MAP,
+                    LogicalOperator,
+                    raw.get("logicalOperator", LogicalOperator.AND.value),
+                ),
+                expressions=[
+                    FilterExpression.from_dict(e) for e in raw.get("expressions", [])
+                ],
+            )
+
+        # Worklist instead of recursion; children are attached in input order
+        root = node(data)
+        stack = [(root, data)]
+        while stack:
+            parent, raw = stack.pop()
+            for child_raw in raw.get("collections", []):
+                child = node(child_raw)
+                parent.collections.append(child)
+                stack.append((child, child_raw))
+        return root
 
 
 # ---------------------------------------------------------------------------
-# JSON Schemas (optional validation if jsonschema is installed)
+# JSON Schemas (optional validation via jsonschema_rs, fastjsonschema or jsonschema)
 # ---------------------------------------------------------------------------
 
 FILTER_SCHEMA: Dict[str, Any] = {
@@ -168,15 +198,63 @@ FILTER_SCHEMA: Dict[str, Any] = {
 }
 
 
-def _validate(instance: Dict[str, Any], schema: Dict[str, Any]) -> None:
+def _compile_validator(schema: Dict[str, Any]) -> Callable[[Any], None]:
     """
-    Validate with jsonschema if available; otherwise no-op.
+    Compile schema once into a callable that raises on invalid instances.
+
+    Prefers jsonschema_rs, then fastjsonschema's generated code (both raise
+    ValueError subclasses), then jsonschema; with none installed, validation
+    is a no-op.
     """
+    try:
+        import jsonschema_rs
+    except ImportError:
+        jsonschema_rs = None
+    if jsonschema_rs is not None:
+        rs = jsonschema_rs.Draft202012Validator(schema)
+
+        def _validate_rs(instance: Any) -> None:
+            # is_valid builds no error objects; validate() only to raise
+            if not rs.is_valid(instance):
+                rs.validate(instance)
+
+        return _validate_rs
+
+    try:
+        import fastjsonschema
+    except ImportError:
+        fastjsonschema = None
+    if fastjsonschema is not None:
+        check = fastjsonschema.compile(schema)
+
+        def _validate_fast(instance: Any) -> None:
+            try:
+                check(instance)
+            except fastjsonschema.JsonSchemaValueException as e:
+                raise ValueError(e.message) from e
+
+        return _validate_fast
+
     try:
         import jsonschema
     except Exception:
-        return
-    jsonschema.validate(instance=instance, schema=schema)
+        return lambda instance: None
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema).validate
+
+
+_FILTER_VALIDATOR = _compile_validator(FILTER_SCHEMA)
+
+
+def _validate(instance: Dict[str, Any], schema: Dict[str, Any]) -> None:
+    """
+    Validate with the compiled validator if available; otherwise no-op.
+    """
+    if schema is FILTER_SCHEMA:
+        _FILTER_VALIDATOR(instance)
+    else:
+        _compile_validator(schema)(instance)
 
 
 def parse_filter_collection_json(
@@ -215,7 +293,7 @@ SEARCH_SCHEMA: Dict[str, Any] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchModel:
     """
     Python-idiomatic model (snake_case) with camelCase JSON interop.
@@ -251,20 +329,26 @@ class SearchModel:
         )
 
 
+def _merged_search_schema() -> Dict[str, Any]:
+    """SEARCH_SCHEMA with FILTER_SCHEMA's $defs inlined, so no resolver is needed."""
+    properties = dict(SEARCH_SCHEMA["properties"])
+    properties["filter"] = {"$ref": "#/$defs/FilterCollection"}
+    return {**SEARCH_SCHEMA, "properties": properties, "$defs": FILTER_SCHEMA["$defs"]}
+
+
+_SEARCH_VALIDATOR = _compile_validator(_merged_search_schema())
+
+# blake2b(sorted-key dump) of SearchModel payloads that passed validation;
+# polling clients resend identical payloads, which then skip the schema pass
+_VALIDATED_SEARCHES: LRUCache[bytes, bool] = LRUCache(2048)
+
+
 def _validate_search(instance: Dict[str, Any]) -> None:
     """
-    Validate SearchModel JSON if jsonschema is available; otherwise no-op.
-    Resolves the nested FilterCollection schema using an in-memory resolver.
+    Validate SearchModel JSON if a validator is available; otherwise no-op.
+    The nested FilterCollection is checked through the inlined $defs.
     """
-    try:
-        import jsonschema
-        from jsonschema import RefResolver
-    except Exception:
-        return
-
-    # Use the filter schema as the base for resolver; it contains $defs we need.
-    resolver = RefResolver.from_schema(FILTER_SCHEMA)
-    jsonschema.validate(instance=instance, schema=SEARCH_SCHEMA, resolver=resolver)
+    _SEARCH_VALIDATOR(instance)
 
 
 def parse_search_model_json(
@@ -278,8 +362,16 @@ def parse_search_model_json(
     """
     data = json.loads(payload) if isinstance(payload, str) else payload
     if validate:
-        _validate_search(data)
-        _validate(data.get("filter", {}), FILTER_SCHEMA)
+        try:
+            dump = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+            key = hashlib.blake2b(dump, digest_size=16).digest()
+        except TypeError:
+            key = None  # not plain JSON; validate every time
+        if key is None or _VALIDATED_SEARCHES.get(key) is None:
+            # Covers the required filter too; no separate FILTER_SCHEMA pass
+            _validate_search(data)
+            if key is not None:
+                _VALIDATED_SEARCHES.put(key, True)
     return SearchModel.from_dict(data)
 
 
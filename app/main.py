@@ -7,25 +7,38 @@ load_dotenv()
 import os
 os.environ["LANGCHAIN_TRACING_V2"] = "false"
 
-import os, re, datetime as dt
+import os, re, asyncio, logging, datetime as dt
 
-from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache, partial
 from pathlib import Path
 from fastapi import Depends, FastAPI, Body, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
 
 from typing import Any, List
 from decimal import Decimal
 
 from .filters import parse_search_model_json
 from .registry import Registry
-from .database import _execute_query_with_conn
+from .database import QUERY_WORKERS, _execute_query_with_conn
 from .query import build_select_from_search
 from .auth import require_roles
 from .auth.require import require_auth, require_roles_access
 from .routes import router as auth_public
 from .ai import router as ai_router
-from .tsx import _to_camel, _as_name, _to_pascal, _infer_ts_type_for_column
+from .ai.endpoints import ai_service
+from .responses import JSONResponse
+from .routing import ORJSONRoute
+from .tsx import (
+    _to_camel,
+    _as_name,
+    _to_pascal,
+    _infer_ts_type_for_column,
+    _render_ts_class,
+    _generate_ts_for,
+)
 from .validation import (
     _assert_columns_allowed,
     _assert_sorts_allowed,
@@ -35,7 +48,13 @@ from .validation import (
 
 GLOBAL_MAX_PAGE_SIZE = int(os.getenv("GLOBAL_MAX_PAGE_SIZE", "1000"))
 
-app = FastAPI(title="Pytitan Data Service with AI", version="2.0.0")
+app = FastAPI(
+    title="Pytitan Data Service with AI",
+    version="2.0.0",
+    default_response_class=JSONResponse,
+)
+# Data endpoints below decode their JSON bodies with orjson
+app.router.route_class = ORJSONRoute
 
 app.include_router(auth_public)
 app.include_router(ai_router)
@@ -43,6 +62,10 @@ app.include_router(ai_router)
 origins_raw = os.getenv("CORS_ALLOW_ORIGINS", "")
 origins = [o.strip() for o in origins_raw.split(",") if o.strip()]
 
+# Middleware must be pure ASGI (__call__(scope, receive, send) handing off to
+# self.app): BaseHTTPMiddleware runs every request through an extra task and
+# stream wrapper. CORS is added last so it stays outermost; _startup enforces
+# the rule.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -53,16 +76,62 @@ app.add_middleware(
 
 REG = Registry()
 
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+log = logging.getLogger("data")
+
+# Blocking Snowflake calls run here so async endpoints keep the event loop free;
+# the connection pool keeps up to this many idle connections per key to match
+_SF_POOL = ThreadPoolExecutor(
+    max_workers=QUERY_WORKERS,
+    thread_name_prefix="snowflake",
+)
+
+
+async def _run_blocking(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_SF_POOL, partial(fn, *args, **kwargs))
+
+
+async def _ensure_entity(name: str):
+    # Cached entries are returned on-loop; only a describe leaves it
+    entry = REG.cached_entity(name)
+    if entry is None:
+        entry = await _run_blocking(REG.ensure_entity, name)
+    return entry
+
+
+_CAMEL_RE1 = re.compile(r'(.)([A-Z][a-z]+)')
+_CAMEL_RE2 = re.compile(r'([a-z0-9])([A-Z])')
 
+
+@lru_cache(maxsize=4096)
 def _to_snake(name: str) -> str:
     """
     Convert camelCase string to snake_case.
     Example: 'developmentAreaId' -> 'development_area_id'
     """
+    if not _has_upper(name):
+        return name
     # Insert an underscore before any uppercase letter that follows a lowercase letter
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
+    s1 = _CAMEL_RE1.sub(r'\1_\2', name)
     # Insert an underscore before any uppercase letter that follows a lowercase letter or digit
-    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+    return _CAMEL_RE2.sub(r'\1_\2', s1).lower()
+
+
+def _has_upper(name: str) -> bool:
+    return any(c.isupper() for c in name)
+
+
+def _has_camel_names(sm) -> bool:
+    if any(map(_has_upper, sm.columns)) or any(map(_has_upper, sm.sort)):
+        return True
+    stack = [sm.filter]
+    while stack:
+        fc = stack.pop()
+        if any(_has_upper(expr.property_name) for expr in fc.expressions):
+            return True
+        stack.extend(fc.collections)
+    return False
 
 
 def _convert_camel_to_snake(sm):
@@ -70,6 +139,10 @@ def _convert_camel_to_snake(sm):
     Convert camelCase property names in SearchModel to snake_case.
     """
     from .filters import FilterExpression, FilterCollection
+
+    # Already snake_case payloads are returned as-is, without rebuilding
+    if not _has_camel_names(sm):
+        return sm
     
     # Convert columns
     converted_columns = [_to_snake(col) for col in sm.columns]
@@ -98,17 +171,27 @@ def _convert_camel_to_snake(sm):
     
     converted_filter = convert_filter_collection(sm.filter)
     
-    # Create new SearchModel with converted names
-    converted_sm = deepcopy(sm)
-    converted_sm.columns = converted_columns
-    converted_sm.sort = converted_sort
-    converted_sm.filter = converted_filter
-    
-    return converted_sm
+    # Create new SearchModel with converted names; every converted part is
+    # freshly built, so a shallow replace is enough
+    return replace(
+        sm,
+        columns=converted_columns,
+        sort=converted_sort,
+        filter=converted_filter,
+    )
+
+
+def _assert_pure_asgi_middleware() -> None:
+    for m in app.user_middleware:
+        if isinstance(m.cls, type) and issubclass(m.cls, BaseHTTPMiddleware):
+            raise RuntimeError(
+                f"{m.cls.__name__} is a BaseHTTPMiddleware; write it as pure ASGI"
+            )
 
 
 @app.on_event("startup")
 def _startup():
+    _assert_pure_asgi_middleware()
     REG.load_views()
     REG.load_cache()
 
@@ -116,20 +199,19 @@ def _startup():
 @app.get("/healthz")
 def health():
     try:
-        from .ai import AIService
-
-        ai_service = AIService()
+        # The /ai router's service; building another would precompile every
+        # schema and open a second conversation store just to list names
         ai_schemas = ai_service.get_available_schemas()
         return {
             "ok": True,
-            "entities": list(REG.entities_cfg.keys()),
+            "entities": REG.entity_names,
             "ai_schemas": ai_schemas,
             "services": ["data", "ai"],
         }
     except Exception as e:
         return {
             "ok": True,
-            "entities": list(REG.entities_cfg.keys()),
+            "entities": REG.entity_names,
             "ai_schemas": [],
             "services": ["data"],
             "ai_error": str(e),
@@ -137,7 +219,7 @@ def health():
 
 
 @app.post("/sql", dependencies=[Depends(require_roles_access(["read:data"]))])
-def build_query(
+async def build_query(
     payload: dict = Body(..., description="SearchModel JSON"),
     paramstyle: str = "pyformat",
     use_ilike: bool = False,
@@ -153,17 +235,15 @@ def build_query(
         if is_camel_case:
             sm = _convert_camel_to_snake(sm)
 
-        entry = REG.ensure_entity(sm.entity_name)
+        entry = await _ensure_entity(sm.entity_name)
         _assert_columns_allowed(sm.entity_name, sm.columns, entry)
         _assert_sorts_allowed(sm.entity_name, sm.sort, entry)
         _assert_filters_allowed(sm.entity_name, sm.filter, entry)
         sm.page_size = _cap_page_size(sm.entity_name, sm.page_size, entry)
 
-        sm_for_sql = deepcopy(sm)
-        sm_for_sql.entity_name = entry["view"]
-
         res = build_select_from_search(
-            sm_for_sql,
+            sm,
+            view_name=entry["view"],
             paramstyle=paramstyle,
             use_ilike=use_ilike,
             quote_identifiers=quote_identifiers,
@@ -186,7 +266,7 @@ def build_query(
 
 
 @app.post("/search", dependencies=[Depends(require_roles_access(["read:data"]))])
-def search(
+async def search(
     payload: dict = Body(..., description="SearchModel JSON"),
     paramstyle: str = "pyformat",
     use_ilike: bool = False,
@@ -195,7 +275,29 @@ def search(
     is_camel_case: bool = False,
     claims: dict = Depends(require_auth),
 ):
-    print("is_camel_case", is_camel_case)
+    result = await _search_impl(
+        payload,
+        paramstyle=paramstyle,
+        use_ilike=use_ilike,
+        quote_identifiers=quote_identifiers,
+        distinct=distinct,
+        is_camel_case=is_camel_case,
+    )
+    # Rendered straight to orjson; a returned dict would first walk every row
+    # through jsonable_encoder
+    return JSONResponse(result)
+
+
+async def _search_impl(
+    payload: dict,
+    *,
+    paramstyle: str,
+    use_ilike: bool,
+    quote_identifiers: bool,
+    distinct: bool,
+    is_camel_case: bool,
+) -> dict:
+    log.debug("is_camel_case %s", is_camel_case)
     try:
         sm = parse_search_model_json(payload, validate=True)
 
@@ -203,17 +305,15 @@ def search(
         if is_camel_case:
             sm = _convert_camel_to_snake(sm)
 
-        entry = REG.ensure_entity(sm.entity_name)
+        entry = await _ensure_entity(sm.entity_name)
         _assert_columns_allowed(sm.entity_name, sm.columns, entry)
         _assert_sorts_allowed(sm.entity_name, sm.sort, entry)
         _assert_filters_allowed(sm.entity_name, sm.filter, entry)
         sm.page_size = _cap_page_size(sm.entity_name, sm.page_size, entry)
 
-        sm_for_sql = deepcopy(sm)
-        sm_for_sql.entity_name = entry["view"]
-
         build = build_select_from_search(
-            sm_for_sql,
+            sm,
+            view_name=entry["view"],
             paramstyle=paramstyle,
             use_ilike=use_ilike,
             quote_identifiers=quote_identifiers,
@@ -223,8 +323,8 @@ def search(
 
         role = os.getenv("SNOWFLAKE_DEFAULT_ROLE")
 
-        cols, rows = _execute_query_with_conn(
-            entry["view"], build.sql, build.params, role=role
+        cols, rows = await _run_blocking(
+            _execute_query_with_conn, entry["view"], build.sql, build.params, role=role
         )
 
         return {
@@ -239,7 +339,7 @@ def search(
     except KeyError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        print(payload)
+        log.debug("search failed for payload %s", payload)
         raise e
         # raise HTTPException(status_code=400, detail=str(e))
 
@@ -300,6 +400,7 @@ def list_entities(
 def reload_registry():
     try:
         summary = REG.refresh_all()
+        _generate_ts_for.cache_clear()
         return {"reloaded": summary}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -315,30 +416,39 @@ def me(claims=Depends(require_auth)):
 
 
 @app.post("/tsx", dependencies=[Depends(require_roles_access(["read:data"]))])
-def search_typescript(
+async def search_typescript(
     payload: dict = Body(..., description="SearchModel JSON"),
     paramstyle: str = "pyformat",
     use_ilike: bool = False,
     quote_identifiers: bool = False,
     distinct: bool = False,
     is_camel_case: bool = False,
+    sample: bool = False,
     claims: dict = Depends(require_auth),  # ← add this
 ):
     """
     Returns a TypeScript class definition with camelCase fields that match the query results.
-    - Reuses /search for validation, mapping, and SQL generation/execution.
-    - Infers property types from the sampled result rows (first page returned by /search).
+    - By default, types come from the cached registry column types; no query is run.
+    - sample=true reuses /search for validation, mapping, and SQL execution, and
+      infers property types from the sampled result rows (first page of /search).
     - If no non-null samples exist for a column, falls back to `unknown | null`.
     """
+    if not sample:
+        entity, class_src = await _ts_from_registry(payload, is_camel_case)
+        generated = dt.datetime.utcnow().isoformat()
+        ts = f"""// Auto-generated from the column registry on {generated}Z
+// View: {entity}
+{class_src}"""
+        return Response(content=ts, media_type="text/plain")
+
     try:
-        base = search(
-            payload=payload,
+        base = await _search_impl(
+            payload,
             paramstyle=paramstyle,
             use_ilike=use_ilike,
             quote_identifiers=quote_identifiers,
             distinct=distinct,
             is_camel_case=is_camel_case,
-            claims=claims,
         )
 
         cols_raw: List[Any] = base.get("columns", [])
@@ -348,29 +458,18 @@ def search_typescript(
         keys = [_to_camel(_as_name(c)) for c in cols_raw]
         keys = [k if k else "col" for k in keys]
 
-        samples_by_col: List[List[Any]] = [[] for _ in keys]
-        for r in rows:
-            for i in range(min(len(keys), len(r))):
-                samples_by_col[i].append(r[i])
+        # Transpose once; result rows all have one value per column
+        samples_by_col: List[List[Any]] = list(map(list, zip(*rows)))[: len(keys)]
+        samples_by_col += [[] for _ in range(len(keys) - len(samples_by_col))]
 
         ts_types = [_infer_ts_type_for_column(samples) for samples in samples_by_col]
 
         class_name = f"{_to_pascal(mapped_view)}"
-
-        props_src = "\n".join(
-            [f"  {keys[i]}: {ts_types[i]} | undefined;" for i in range(len(keys))]
-        )
+        class_src = _render_ts_class(class_name, list(zip(keys, ts_types)))
 
         ts = f"""// Auto-generated from /search on {dt.datetime.utcnow().isoformat()}Z
 // View: {mapped_view}
-export class {class_name} {{
-{props_src}
-
-  constructor(init?: Partial<{class_name}>) {{
-    Object.assign(this, init);
-  }}
-}}
-"""
+{class_src}"""
         return Response(content=ts, media_type="text/plain")
 
     except Exception:
@@ -379,8 +478,27 @@ export class {class_name} {{
         raise HTTPException(status_code=400, detail=str(e))
 
 
+async def _ts_from_registry(payload: dict, is_camel_case: bool) -> tuple[str, str]:
+    """Validate payload like /search, then render from cached column types."""
+    try:
+        sm = parse_search_model_json(payload, validate=True)
+        if is_camel_case:
+            sm = _convert_camel_to_snake(sm)
+
+        entry = await _ensure_entity(sm.entity_name)
+        _assert_columns_allowed(sm.entity_name, sm.columns, entry)
+        columns = entry["columns"]
+        names = [c.upper() for c in sm.columns if c != "*"] or list(columns)
+        cols = tuple((name, columns[name]) for name in names)
+        return sm.entity_name, _generate_ts_for(sm.entity_name, cols)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.post("/save", dependencies=[Depends(require_roles_access(["read:data"]))])
-def save(
+async def save(
     user_id: int = Body(..., description="User ID"),
     object_type: str = Body(..., description="Object type"),
     object_key: str = Body(..., description="Object key"),
@@ -391,7 +509,7 @@ def save(
     Save data by calling the SC_FIRE_EVENT stored procedure in Snowflake.
     """
     try:
-        print(claims)
+        log.debug("save claims %s", claims)
         # Prepare the stored procedure call
         sql = "CALL SC_FIRE_EVENT(%(user_id)s, %(object_type)s, %(object_key)s, %(payload)s)"
         params = {
@@ -404,8 +522,8 @@ def save(
         role = os.getenv("SNOWFLAKE_DEFAULT_ROLE")
         
         # Execute the stored procedure
-        cols, rows = _execute_query_with_conn(
-            "SC_FIRE_EVENT", sql, params, role=role
+        cols, rows = await _run_blocking(
+            _execute_query_with_conn, "SC_FIRE_EVENT", sql, params, role=role
         )
         
         return {
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, List, Sequence, Tuple, Union, Iterable, Optional
 import re
 
@@ -96,49 +97,72 @@ def _normalize_in_values(raw: Union[str, Sequence[Any]]) -> List[Any]:
     return [str(x) for x in items]
 
 
+# Filter shape: (logical operator, ((column, operator, placeholder count), ...),
+# (child shapes, ...)). Values never appear in it, so filters that differ only
+# in their values share one compiled WHERE template.
+_Shape = Tuple[LogicalOperator, Tuple[Tuple[str, Operator, int], ...], tuple]
+
+_LIKE_OPS = (Operator.LK, Operator.SW, Operator.EW)
+_IN_OPS = (Operator.IN, Operator.NIN)
+_COMPARE_SQL = {
+    Operator.EQ: "=",
+    Operator.NE: "<>",
+    Operator.GT: ">",
+    Operator.GTE: ">=",
+    Operator.LT: "<",
+    Operator.LTE: "<=",
+}
+
+
+def _expr_values(e: FilterExpression) -> List[Any]:
+    """Bound parameter values for one expression, in placeholder order."""
+    op = e.operator
+    if op in _LIKE_OPS:
+        return [_format_like_pattern(e.value, op)]
+    if op in _IN_OPS:
+        return _normalize_in_values(e.value)
+    return [str(e.value)]
+
+
+def _filter_shape(node: FilterCollection, values: List[Any]) -> _Shape:
+    """Shape of node; appends its parameter values to values in walk order."""
+    exprs = []
+    for e in node.expressions:
+        vals = _expr_values(e)
+        values.extend(vals)
+        exprs.append((e.property_name, e.operator, len(vals)))
+    children = tuple(_filter_shape(c, values) for c in node.collections)
+    return node.logical_operator, tuple(exprs), children
+
+
 def _build_expr_sql(
-    e: FilterExpression,
+    col: str,
+    op: Operator,
+    n_values: int,
     sink: _ParamSink,
     *,
     use_ilike: bool,
-    quote_identifiers: bool,
 ) -> str:
-    col = _quote_identifier(e.property_name, quote_identifiers=quote_identifiers)
-    op = e.operator
-
     # LIKE / ILIKE family
-    if op in (Operator.LK, Operator.SW, Operator.EW):
-        patt = _format_like_pattern(e.value, op)
-        ph = sink.add(patt)
+    if op in _LIKE_OPS:
+        ph = sink.add(None)
         like_kw = "ILIKE" if use_ilike else "LIKE"
         return f"{col} {like_kw} {ph} ESCAPE '\\'"
 
     # IN / NOT IN
-    if op in (Operator.IN, Operator.NIN):
-        vals = _normalize_in_values(e.value)
-        if not vals:
+    if op in _IN_OPS:
+        if not n_values:
             # IN () is always false; NOT IN () is always true
             return "1=0" if op == Operator.IN else "1=1"
-        phs = ", ".join(sink.add(str(v)) for v in vals)
+        phs = ", ".join(sink.add(None) for _ in range(n_values))
         neg = "NOT " if op == Operator.NIN else ""
         return f"{col} {neg}IN ({phs})"
 
     # Scalar compares
-    rhs = sink.add(str(e.value))
-    if op == Operator.EQ:
-        return f"{col} = {rhs}"
-    if op == Operator.NE:
-        return f"{col} <> {rhs}"
-    if op == Operator.GT:
-        return f"{col} > {rhs}"
-    if op == Operator.GTE:
-        return f"{col} >= {rhs}"
-    if op == Operator.LT:
-        return f"{col} < {rhs}"
-    if op == Operator.LTE:
-        return f"{col} <= {rhs}"
-
-    raise ValueError(f"Unsupported operator: {op}")
+    cmp = _COMPARE_SQL.get(op)
+    if cmp is None:
+        raise ValueError(f"Unsupported operator: {op}")
+    return f"{col} {cmp} {sink.add(None)}"
 
 
 def _combine(parts: List[str], logical: LogicalOperator) -> str:
@@ -150,6 +174,42 @@ def _combine(parts: List[str], logical: LogicalOperator) -> str:
     return "(" + joiner.join(parts) + ")"
 
 
+@lru_cache(maxsize=512)
+def _where_template(
+    shape: _Shape,
+    paramstyle: str,
+    use_ilike: bool,
+    quote_identifiers: bool,
+    param_name_prefix: str,
+    param_start_index: int,
+) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Predicate text for a filter shape ("" when empty) and, for pyformat, the
+    parameter names in placeholder order.
+    """
+    sink = _ParamSink(
+        paramstyle, prefix=param_name_prefix, start_index=param_start_index
+    )
+
+    def walk(node: _Shape) -> str:
+        logical, exprs, children = node
+        parts: List[str] = []
+        for prop, op, n_values in exprs:
+            col = _quote_identifier(prop, quote_identifiers=quote_identifiers)
+            parts.append(_build_expr_sql(col, op, n_values, sink, use_ilike=use_ilike))
+        for c in children:
+            child = walk(c)
+            if child:
+                parts.append(child)
+        return _combine(parts, logical)
+
+    body = walk(shape).strip()
+    # drop outer parens for prettiness
+    if body.startswith("(") and body.endswith(")"):
+        body = body[1:-1]
+    return body, tuple(sink.params_dict)
+
+
 def build_where_clause_and_params(
     root: FilterCollection,
     *,
@@ -164,35 +224,26 @@ def build_where_clause_and_params(
     """
     Returns (where_sql, params). If `include_where_keyword` is True,
     where_sql will be 'WHERE ...'; otherwise it's just the predicate text.
+
+    The SQL text is compiled once per filter shape (columns, operators, tree
+    structure, IN-list lengths); only the parameter values are rebuilt.
     """
-    sink = _ParamSink(
-        paramstyle, prefix=param_name_prefix, start_index=param_start_index
+    values: List[Any] = []
+    shape = _filter_shape(root, values)
+    body, names = _where_template(
+        shape,
+        paramstyle,
+        use_ilike,
+        quote_identifiers,
+        param_name_prefix,
+        param_start_index,
     )
-
-    def walk(node: FilterCollection) -> str:
-        parts: List[str] = []
-        for e in node.expressions:
-            parts.append(
-                _build_expr_sql(
-                    e, sink, use_ilike=use_ilike, quote_identifiers=quote_identifiers
-                )
-            )
-        for c in node.collections:
-            child = walk(c)
-            if child:
-                parts.append(child)
-        return _combine(parts, node.logical_operator)
-
-    body = walk(root).strip()
     if not body:
         body = default_when_empty
-    else:
-        # drop outer parens for prettiness
-        if body.startswith("(") and body.endswith(")"):
-            body = body[1:-1]
 
     where_sql = f"WHERE {body}" if include_where_keyword else body
-    return where_sql, sink.bundle()
+    params = values if paramstyle == "qmark" else dict(zip(names, values))
+    return where_sql, params
 
 
 # -----------------------------------------------------------------------------
@@ -284,23 +335,23 @@ def build_select_from_search(
     quote_identifiers: bool = False,
     distinct: bool = False,
     include_count: bool = False,
+    view_name: Optional[str] = None,
 ) -> SelectBuildResult:
     """
     Build a complete SELECT (Snowflake-friendly) from SearchModel.
     - SELECT list from sm.columns (expressions passed through)
-    - FROM from sm.entity_name (supports db.schema.table)
+    - FROM from view_name, else sm.entity_name (supports db.schema.table)
     - WHERE from sm.filter (parametrized)
     - ORDER BY from sm.sort (supports '-col', 'col DESC', 'col:desc')
     - LIMIT/OFFSET from sm.page_size / sm.page_index
     """
-    if not sm.entity_name:
+    from_path = view_name or sm.entity_name
+    if not from_path:
         raise ValueError("SearchModel.entity_name is required")
 
     select_list = _normalize_columns(sm.columns, quote_identifiers=quote_identifiers)
     distinct_kw = "DISTINCT " if distinct else ""
-    from_name = _quote_dotted_identifier(
-        sm.entity_name, quote_identifiers=quote_identifiers
-    )
+    from_name = _quote_dotted_identifier(from_path, quote_identifiers=quote_identifiers)
 
     # WHERE (skip adding WHERE if filter is empty)
     where_body, params = build_where_clause_and_params(
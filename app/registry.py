@@ -1,11 +1,14 @@
-import yaml, json, os, time, typing as t
+import yaml, json, orjson, os, time, typing as t
 from pathlib import Path
-from .database import _describe_view_snowflake
+from .database import _describe_view_snowflake, _describe_views_snowflake
 
 VIEWS_PATH = Path(os.getenv("VIEWS_FILE", "config/views.yaml"))
 CACHE_PATH = Path(os.getenv("COLUMNS_CACHE_FILE", "config/columns_cache.json"))
 GLOBAL_MAX_PAGE_SIZE = int(os.getenv("GLOBAL_MAX_PAGE_SIZE", "1000"))
 
+# libyaml-backed loader when PyYAML was built with it; ~10x faster to parse
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class EntityMeta(t.TypedDict, total=False):
     view: str
@@ -23,18 +26,20 @@ class Registry:
     def __init__(self):
         self.entities_cfg: dict[str, EntityMeta] = {}
         self.columns_cache: dict[str, RegistryEntry] = {}
+        # Set when columns_cache changes; save_cache is a no-op otherwise
+        self._dirty = False
+        # CACHE_PATH's mtime when this process last read or wrote it
+        self._synced_mtime_ns: int | None = None
+        # Entity names in views-file order, rebuilt only when views are loaded
+        self.entity_names: tuple[str, ...] = ()
 
     def load_views(self) -> None:
         if not VIEWS_PATH.exists():
             raise RuntimeError(f"View mapping file not found: {VIEWS_PATH}")
-        with VIEWS_PATH.open("r", encoding="utf-8") as f:
-            if VIEWS_PATH.suffix.lower() in (".yaml", ".yml"):
-                if not yaml:
-                    raise RuntimeError(
-                        "PyYAML not installed but a YAML views file was provided."
-                    )
-                cfg = yaml.safe_load(f)
-            else:
+        if VIEWS_PATH.suffix.lower() in (".yaml", ".yml"):
+            cfg = self._load_yaml_views()
+        else:
+            with VIEWS_PATH.open("r", encoding="utf-8") as f:
                 cfg = json.load(f)
         ents = cfg.get("entities", {})
         norm: dict[str, EntityMeta] = {}
@@ -46,6 +51,31 @@ class Registry:
                 item["maxPageSize"] = int(v["maxPageSize"])
             norm[k] = item
         self.entities_cfg = norm
+        self.entity_names = tuple(norm)
+
+    def _load_yaml_views(self) -> dict:
+        """Parse the YAML views, via a views.json sidecar while it is current."""
+        sidecar = VIEWS_PATH.with_suffix(".json")
+        try:
+            if sidecar.stat().st_mtime_ns >= VIEWS_PATH.stat().st_mtime_ns:
+                with sidecar.open("r", encoding="utf-8") as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass  # no usable sidecar; fall back to the YAML
+        if not yaml:
+            raise RuntimeError(
+                "PyYAML not installed but a YAML views file was provided."
+            )
+        with VIEWS_PATH.open("r", encoding="utf-8") as f:
+            cfg = yaml.load(f, Loader=_YAML_LOADER)
+        try:
+            tmp = sidecar.with_suffix(".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(cfg, f)
+            tmp.replace(sidecar)
+        except (OSError, TypeError):
+            pass  # read-only config dir or non-JSON values; reparse next boot
+        return cfg
 
     def load_cache(self) -> None:
         if CACHE_PATH.exists():
@@ -53,20 +83,39 @@ class Registry:
                 self.columns_cache = json.load(f)
         else:
             self.columns_cache = {}
+        self._dirty = False
+        self._synced_mtime_ns = self._cache_mtime_ns()
 
     def save_cache(self) -> None:
+        if not self._dirty:
+            return
         tmp = CACHE_PATH.with_suffix(".tmp")
-        with tmp.open("w", encoding="utf-8") as f:
-            json.dump(self.columns_cache, f, indent=2)
+        tmp.write_bytes(orjson.dumps(self.columns_cache, option=orjson.OPT_INDENT_2))
         tmp.replace(CACHE_PATH)
+        self._dirty = False
+        self._synced_mtime_ns = self._cache_mtime_ns()
 
-    def ensure_entity(self, name: str) -> RegistryEntry:
+    @staticmethod
+    def _cache_mtime_ns() -> int | None:
+        try:
+            return CACHE_PATH.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def cached_entity(self, name: str) -> RegistryEntry | None:
+        """The entry ensure_entity would return, or None if it needs a describe."""
         if name not in self.entities_cfg:
             raise KeyError(f"Unknown entity: {name}")
-        cfg = self.entities_cfg[name]
         cached = self.columns_cache.get(name)
-        if cached and cached.get("view") == cfg["view"]:
+        if cached and cached.get("view") == self.entities_cfg[name]["view"]:
+            return cached
+        return None
+
+    def ensure_entity(self, name: str) -> RegistryEntry:
+        cached = self.cached_entity(name)
+        if cached is not None:
             return cached
+        cfg = self.entities_cfg[name]
         cols = _describe_view_snowflake(cfg["view"])
         entry: RegistryEntry = {
             "view": cfg["view"],
@@ -75,22 +124,51 @@ class Registry:
             "maxPageSize": int(cfg.get("maxPageSize", GLOBAL_MAX_PAGE_SIZE)),
         }
         self.columns_cache[name] = entry
+        # Skip the rewrite when another worker already wrote these columns;
+        # the file then matches memory unless something else was pending
+        if self._on_disk_matches(name, entry):
+            return entry
+        self._dirty = True
         self.save_cache()
         return entry
 
+    def _on_disk_matches(self, name: str, entry: RegistryEntry) -> bool:
+        mtime_ns = self._cache_mtime_ns()
+        if mtime_ns is None or mtime_ns == self._synced_mtime_ns:
+            # Untouched since this process synced it, so it lacks the entry
+            return False
+        try:
+            with CACHE_PATH.open("r", encoding="utf-8") as f:
+                on_disk = json.load(f).get(name) or {}
+        except (OSError, ValueError):
+            return False
+        return (
+            on_disk.get("view") == entry["view"]
+            and on_disk.get("columns") == entry["columns"]
+            and on_disk.get("maxPageSize") == entry["maxPageSize"]
+        )
+
     def refresh_all(self) -> dict[str, str]:
         """Re-read views file and re-discover all entities."""
         self.load_views()
         summaries: dict[str, str] = {}
+        # One describe query per (db, schema) rather than one per entity
+        described, errors = _describe_views_snowflake(
+            meta["view"] for meta in self.entities_cfg.values()
+        )
         for name, meta in self.entities_cfg.items():
+            if meta["view"] in errors:
+                summaries[name] = f"error: {errors[meta['view']]}"
+                continue
             try:
-                cols = _describe_view_snowflake(meta["view"])
+                cols = described[meta["view"]]
                 self.columns_cache[name] = {
                     "view": meta["view"],
                     "columns": cols,
                     "loadedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
                     "maxPageSize": int(meta.get("maxPageSize", GLOBAL_MAX_PAGE_SIZE)),
                 }
+                self._dirty = True
                 summaries[name] = f"ok ({len(cols)} cols)"
             except Exception as e:
                 summaries[name] = f"error: {e}"
@@ -0,0 +1,40 @@
+import json
+import typing as t
+from decimal import Decimal
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+
+
+def _default(obj: t.Any) -> t.Any:
+    """Encode the Snowflake values orjson has no native support for."""
+    if isinstance(obj, Decimal):
+        # Same as FastAPI's jsonable_encoder: integral -> int, else float
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONResponse(ORJSONResponse):
+    """orjson-rendered response; returned directly it also skips jsonable_encoder."""
+
+    def render(self, content: t.Any) -> bytes:
+        try:
+            return orjson.dumps(
+                content,
+                default=_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            )
+        except TypeError:
+            # orjson stops at 64-bit ints, and NUMBER(38,0) goes past that;
+            # render those payloads the way Starlette's JSONResponse does
+            return json.dumps(
+                jsonable_encoder(content),
+                ensure_ascii=False,
+                allow_nan=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
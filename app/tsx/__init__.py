@@ -9,6 +9,8 @@ from .generator import (
     _as_name,
     _to_pascal,
     _infer_ts_type_for_column,
+    _render_ts_class,
+    _generate_ts_for,
 )
 
 __all__ = [
@@ -16,4 +18,6 @@ __all__ = [
     "_as_name",
     "_to_pascal",
     "_infer_ts_type_for_column",
+    "_render_ts_class",
+    "_generate_ts_for",
 ]
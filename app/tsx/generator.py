@@ -1,5 +1,7 @@
 import re, datetime as dt
-from typing import Any, List
+from functools import lru_cache
+from itertools import starmap
+from typing import Any, List, Sequence, Tuple
 from decimal import Decimal
 
 _camel_word_re = re.compile(r"[^0-9A-Za-z]+")
@@ -30,29 +32,36 @@ def _to_pascal(s: str) -> str:
 
 def _infer_ts_scalar_type(v: Any) -> str:
     # Map Python runtime values to TS primitives.
-    if v is None:
+    return _ts_kind_for_type(type(v))
+
+
+@lru_cache(maxsize=None)
+def _ts_kind_for_type(tp: type) -> str:
+    # Same checks as isinstance on a value; a result column has few types
+    if tp is type(None):
         return "null"
-    if isinstance(v, bool):
+    if issubclass(tp, bool):
         return "boolean"
-    if isinstance(v, (int, float, Decimal)):
+    if issubclass(tp, (int, float, Decimal)):
         return "number"
-    if isinstance(v, (dt.datetime, dt.date, dt.time)):
+    if issubclass(tp, (dt.datetime, dt.date, dt.time)):
         # JSON encodes these as strings; using string in TS keeps things simple.
         return "string"
-    if isinstance(v, (list, tuple)):
+    if issubclass(tp, (list, tuple)):
         return "unknown[]"
-    if isinstance(v, dict):
+    if issubclass(tp, dict):
         return "Record<string, unknown>"
-    if isinstance(v, (bytes, bytearray, memoryview)):
+    if issubclass(tp, (bytes, bytearray, memoryview)):
         return "string"
-    if isinstance(v, str):
+    if issubclass(tp, str):
         return "string"
     return "unknown"
 
 
 def _infer_ts_type_for_column(samples: List[Any]) -> str:
-    # Collect observed types across sample values.
-    kinds = {_infer_ts_scalar_type(v) for v in samples}
+    # Collect observed types across sample values: one C-level map(type)
+    # pass, then each distinct type is classified once.
+    kinds = {_ts_kind_for_type(tp) for tp in set(map(type, samples))}
     # Separate nulls from non-nulls
     non_null = kinds - {"null"}
     has_null = "null" in kinds
@@ -66,3 +75,44 @@ def _infer_ts_type_for_column(samples: List[Any]) -> str:
         base = "unknown"
 
     return f"{base} | null" if has_null else base
+
+
+# Registry TYPE_CATEGORY -> TS primitive; dates and times travel as strings
+_TS_BY_CATEGORY = {
+    "TEXT": "string",
+    "NUMBER": "number",
+    "BOOLEAN": "boolean",
+    "DATE": "string",
+    "TIMESTAMP": "string",
+    "TIME": "string",
+}
+
+
+_TS_CLASS_TAIL = """
+
+  constructor(init?: Partial<{}>) {{
+    Object.assign(this, init);
+  }}
+}}
+"""
+
+
+def _render_ts_class(class_name: str, props: Sequence[Tuple[str, str]]) -> str:
+    props_src = "\n".join(starmap("  {}: {} | undefined;".format, props))
+    # One join over the pieces; only the class name varies in the tail
+    tail = _TS_CLASS_TAIL.format(class_name)
+    return "".join(("export class ", class_name, " {\n", props_src, tail))
+
+
+@lru_cache(maxsize=256)
+def _generate_ts_for(entity: str, cols: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    Class source for (COLUMN_NAME, TYPE_CATEGORY) pairs from the registry.
+
+    The registry does not record nullability, so every field admits null.
+    """
+    props = [
+        (_to_camel(name) or "col", _TS_BY_CATEGORY.get(category, "unknown") + " | null")
+        for name, category in cols
+    ]
+    return _render_ts_class(_to_pascal(entity), props)
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 from ..registry import RegistryEntry
 from ..filters import FilterCollection, Operator
@@ -7,26 +8,53 @@ GLOBAL_MAX_PAGE_SIZE = int(os.getenv("GLOBAL_MAX_PAGE_SIZE", "1000"))
 _TEXTY = {"TEXT"}
 _NUMERIC = {"NUMBER"}
 _DATES = {"DATE", "TIMESTAMP", "TIME"}
+_RANGE_TYPES = frozenset(_NUMERIC | _DATES)
+_TEXT_OPS = frozenset((Operator.LK, Operator.SW, Operator.EW))
+_RANGE_OPS = frozenset((Operator.GT, Operator.GTE, Operator.LT, Operator.LTE))
+
+# Operator -> (column types it accepts, error template); others take any type
+_OP_REQUIRED_TYPES: dict[Operator, tuple[frozenset[str], str]] = {
+    **dict.fromkeys(
+        _TEXT_OPS,
+        (frozenset(_TEXTY), "Operator {op} not allowed on non-text column {col}"),
+    ),
+    **dict.fromkeys(
+        _RANGE_OPS,
+        (_RANGE_TYPES, "Operator {op} not allowed on column {col} of type {typ}"),
+    ),
+}
+
+
+def _upper(name: str) -> str:
+    # Registry column names are usually already uppercase; skip the copy
+    return name if name.isupper() else name.upper()
 
 
 def _assert_columns_allowed(entity: str, cols: list[str], reg: RegistryEntry) -> None:
     if not cols or cols == ["*"]:
         return
-    allowed = set(reg["columns"].keys())
+    allowed = reg["columns"]  # dict membership; no per-request set copy
     for c in cols:
-        if c.upper() not in allowed and c != "*":
+        if _upper(c) not in allowed and c != "*":
             raise ValueError(f"Column not allowed for {entity}: {c}")
 
 
+@lru_cache(maxsize=1024)
+def _sort_column(sort: str) -> tuple[str, str] | None:
+    """(column as written, uppercased) for a sort spec; None when blank."""
+    s = sort.strip()
+    if not s:
+        return None
+    col = s[1:] if s.startswith("-") else s.split(":")[0].split()[0]
+    return col, _upper(col)
+
+
 def _assert_sorts_allowed(entity: str, sorts: list[str], reg: RegistryEntry) -> None:
-    allowed = set(reg["columns"].keys())
+    allowed = reg["columns"]
     for s in sorts or []:
-        s = s.strip()
-        if not s:
-            continue
-        col = s[1:] if s.startswith("-") else s.split(":")[0].split()[0]
-        if col.upper() not in allowed:
-            raise ValueError(f"Sort field not allowed for {entity}: {col}")
+        parsed = _sort_column(s)
+        if parsed is not None and parsed[1] not in allowed:
+            raise ValueError(f"Sort field not allowed for {entity}: {parsed[0]}")
 
 
 def _assert_filters_allowed(
@@ -34,34 +62,24 @@ def _assert_filters_allowed(
 ) -> None:
     allowed = reg["columns"]
 
-    def walk(node: FilterCollection):
+    # Depth-first, expressions before child collections, without recursion
+    stack = [fc]
+    while stack:
+        node = stack.pop()
         for e in node.expressions:
-            col = e.property_name.upper()
-            if col not in allowed:
+            typ = allowed.get(_upper(e.property_name))
+            if typ is None:
                 raise ValueError(
                     f"Filter column not allowed for {entity}: {e.property_name}"
                 )
-            typ = allowed[col]
-            if (
-                e.operator in (Operator.LK, Operator.SW, Operator.EW)
-                and typ not in _TEXTY
-            ):
-                raise ValueError(
-                    f"Operator {e.operator.value} not allowed on non-text column {e.property_name}"
-                )
-            if e.operator in (
-                Operator.GT,
-                Operator.GTE,
-                Operator.LT,
-                Operator.LTE,
-            ) and typ not in (_NUMERIC | _DATES):
+            required = _OP_REQUIRED_TYPES.get(e.operator)
+            if required is not None and typ not in required[0]:
                 raise ValueError(
-                    f"Operator {e.operator.value} not allowed on column {e.property_name} of type {typ}"
+                    required[1].format(
+                        op=e.operator.value, col=e.property_name, typ=typ
+                    )
                 )
-        for c in node.collections:
-            walk(c)
-
-    walk(fc)
+        stack.extend(reversed(node.collections))
 
 
 def _cap_page_size(entity: str, page_size: int, reg: RegistryEntry) -> int:
@@ -29,4 +29,4 @@ echo "Press Ctrl+C to stop the service"
 echo ""
 
 # Start uvicorn with reload for development
-uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
+uvicorn app.main:app --reload --loop uvloop --http httptools --host 0.0.0.0 --port 8000